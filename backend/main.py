@@ -24,6 +24,11 @@ from routes.integration import router as integration_router
 from routes.analytics import router as analytics_router
 from routes.usage import router as usage_router
 from routes.share import router as share_router
+from services.context_service import context_service
+from services.deployment_service import deployment_service
+from services.git_service import git_service
+from services.github_service import github_service
+from services.email import close_resend_client, start_email_workers, stop_email_workers
 from config import settings, cors_origins
 from models.database import Base, engine
 import os
@@ -162,6 +167,9 @@ async def startup_event():
     os.makedirs(settings.chromadb_path, exist_ok=True)
     os.makedirs(settings.projects_path, exist_ok=True)
     
+    # Start background email delivery
+    start_email_workers()
+    
     print("🚀 Intelekt API started successfully!")
     print(f"💾 Database initialized")
     print(f"📊 ChromaDB path: {settings.chromadb_path}")
@@ -171,6 +179,17 @@ async def startup_event():
     print(f"🔐 Authentication: Enabled")
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Flush buffered state and close shared clients before the process exits."""
+    context_service.flush()
+    await stop_email_workers()
+    await deployment_service.aclose()
+    await github_service.aclose()
+    git_service.close()
+    await close_resend_client()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
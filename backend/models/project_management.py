@@ -5,8 +5,8 @@ Comprehensive models for product management, project tracking,
 collaboration, and communication features.
 """
 
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
+from pydantic import BaseModel, Field, computed_field
+from typing import Optional, List, Dict, Any, Set
 from datetime import datetime
 from enum import Enum
 
@@ -332,6 +332,24 @@ class Epic(BaseModel):
 
 # ============== TEAM MODELS ==============
 
+# Role sets used for permission checks
+_EDIT_TASK_EXCLUDES = frozenset({TeamRole.VIEWER})
+_MANAGE_SPRINT_ROLES = frozenset({TeamRole.OWNER, TeamRole.ADMIN, TeamRole.PRODUCT_MANAGER})
+_MANAGE_TEAM_ROLES = frozenset({TeamRole.OWNER, TeamRole.ADMIN})
+
+# Permissions derived from role:
+# (can_edit_tasks, can_manage_sprints, can_manage_team, can_delete_project)
+_ROLE_PERMS: Dict[TeamRole, tuple] = {
+    role: (
+        role not in _EDIT_TASK_EXCLUDES,
+        role in _MANAGE_SPRINT_ROLES,
+        role in _MANAGE_TEAM_ROLES,
+        role == TeamRole.OWNER,
+    )
+    for role in TeamRole
+}
+
+
 class TeamMember(BaseModel):
     """Team member in a project."""
     id: str
@@ -345,15 +363,30 @@ class TeamMember(BaseModel):
     
     role: TeamRole = TeamRole.DEVELOPER
     
-    # Permissions
-    can_edit_tasks: bool = True
-    can_manage_sprints: bool = False
-    can_manage_team: bool = False
-    can_delete_project: bool = False
-    
     joined_at: datetime
     last_active: Optional[datetime] = None
     is_active: bool = True
+    
+    # Permissions (derived from role)
+    @computed_field
+    @property
+    def can_edit_tasks(self) -> bool:
+        return _ROLE_PERMS[self.role][0]
+    
+    @computed_field
+    @property
+    def can_manage_sprints(self) -> bool:
+        return _ROLE_PERMS[self.role][1]
+    
+    @computed_field
+    @property
+    def can_manage_team(self) -> bool:
+        return _ROLE_PERMS[self.role][2]
+    
+    @computed_field
+    @property
+    def can_delete_project(self) -> bool:
+        return _ROLE_PERMS[self.role][3]
 
 
 class TeamInvite(BaseModel):
@@ -427,7 +460,7 @@ class Channel(BaseModel):
     is_private: bool = False
     
     # Members (for private channels)
-    member_ids: List[str] = Field(default_factory=list)
+    member_ids: Set[str] = Field(default_factory=set)
     
     # Settings
     muted_by: List[str] = Field(default_factory=list)
@@ -470,6 +503,9 @@ class Message(BaseModel):
     edited_at: Optional[datetime] = None
     deleted: bool = False
     
+    # Per-channel sequence number (monotonic, used for pagination)
+    seq: int = 0
+    
     created_at: datetime
 
 
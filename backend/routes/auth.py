@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import timedelta
 from pydantic import BaseModel, EmailStr
@@ -15,7 +15,7 @@ from utils.auth import (
     verify_reset_token,
     get_current_user
 )
-from services.email import send_verification_email, send_password_reset_email
+from services.email import enqueue_email, send_verification_email, send_password_reset_email
 
 router = APIRouter(prefix="/api/auth", tags=["authentication"])
 
@@ -37,7 +37,6 @@ class VerifyEmailRequest(BaseModel):
 @router.post("/register", response_model=Token, status_code=status.HTTP_201_CREATED)
 async def register(
     user_data: UserCreate, 
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Register a new user."""
@@ -74,7 +73,7 @@ async def register(
     
     # Send verification email in background
     verification_token = create_verification_token(new_user.email)
-    background_tasks.add_task(send_verification_email, new_user.email, verification_token)
+    await enqueue_email(send_verification_email, new_user.email, verification_token)
     
     # Create access token
     access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -132,7 +131,6 @@ async def get_me(current_user: User = Depends(get_current_user)):
 @router.post("/forgot-password")
 async def forgot_password(
     request: ForgotPasswordRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db)
 ):
     """Request password reset email."""
@@ -141,7 +139,7 @@ async def forgot_password(
     # Always return success to prevent email enumeration
     if user:
         reset_token = create_reset_token(user.email)
-        background_tasks.add_task(send_password_reset_email, user.email, reset_token)
+        await enqueue_email(send_password_reset_email, user.email, reset_token)
     
     return {"message": "If an account with that email exists, a password reset link has been sent."}
 
@@ -205,7 +203,6 @@ async def verify_email(
 
 @router.post("/resend-verification")
 async def resend_verification(
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user)
 ):
     """Resend verification email."""
@@ -213,6 +210,6 @@ async def resend_verification(
         return {"message": "Email is already verified"}
     
     verification_token = create_verification_token(current_user.email)
-    background_tasks.add_task(send_verification_email, current_user.email, verification_token)
+    await enqueue_email(send_verification_email, current_user.email, verification_token)
     
     return {"message": "Verification email sent"}
@@ -50,7 +50,7 @@ async def get_project_context(project_id: str):
         "decisions": context.decisions,
         "patterns": context.patterns,
         "conversation_summary": context.conversation_summary,
-        "last_updated": context.last_updated.isoformat()
+        "last_updated": context.last_updated_at.isoformat()
     }
 
 
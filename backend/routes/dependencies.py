@@ -96,9 +96,8 @@ async def analyze_project_dependencies(project_id: str):
     Analyze dependencies for an existing project.
     """
     try:
-        # Get project files
-        project_files = code_generator.get_project_files(project_id)
-        files = {f["path"]: f["content"] for f in project_files}
+        # Get project files as raw bytes; import scanning needs no decoding
+        files = code_generator.get_project_file_bytes(project_id)
         
         if not files:
             return {
@@ -126,9 +125,8 @@ async def generate_project_dependencies(project_id: str):
     Generate and save dependency files for a project.
     """
     try:
-        # Get project files
-        project_files = code_generator.get_project_files(project_id)
-        files = {f["path"]: f["content"] for f in project_files}
+        # Get project files as raw bytes; import scanning needs no decoding
+        files = code_generator.get_project_file_bytes(project_id)
         
         if not files:
             raise HTTPException(status_code=404, detail="Project has no files")
@@ -164,7 +162,7 @@ async def get_python_mappings():
     """Get Python import to package name mappings."""
     from services.dependency_service import PYTHON_PACKAGE_MAPPINGS
     return {
-        "mappings": {k: v for k, v in PYTHON_PACKAGE_MAPPINGS.items() if v}
+        "mappings": dict(PYTHON_PACKAGE_MAPPINGS)
     }
 
 
@@ -173,5 +171,5 @@ async def get_js_mappings():
     """Get JavaScript import to package name mappings."""
     from services.dependency_service import JS_PACKAGE_MAPPINGS
     return {
-        "mappings": JS_PACKAGE_MAPPINGS
+        "mappings": dict(JS_PACKAGE_MAPPINGS)
     }
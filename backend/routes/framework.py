@@ -6,7 +6,7 @@ guiding users through idea development before code generation.
 """
 
 from fastapi import APIRouter, HTTPException, Request
-from fastapi.responses import StreamingResponse
+from fastapi.responses import Response, StreamingResponse
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 from typing import Optional
@@ -14,10 +14,11 @@ from models.schemas import (
     ChatMessage, AIProvider, FrameworkStepUpdate, 
     FrameworkProgress, ProjectPhase
 )
-from services.framework_service import framework_service, MIT_24_STEPS, FrameworkPhase
+from services.framework_service import framework_service, serialize_session, MIT_24_STEPS, FrameworkPhase, StepStatus
 from services import ai_service
 from datetime import datetime
 import json
+import orjson
 
 router = APIRouter(prefix="/api/framework", tags=["framework"])
 limiter = Limiter(key_func=get_remote_address)
@@ -40,14 +41,14 @@ async def initialize_framework(project_id: str, idea: dict):
         session = framework_service.initialize_framework(project_id, idea_description)
         
         # Mark step 1 as in progress
-        session["steps"]["1"]["status"] = "in_progress"
+        session["steps"][1].status = StepStatus.IN_PROGRESS
         
         return {
             "success": True,
             "project_id": project_id,
             "current_step": 1,
             "current_phase": FrameworkPhase.CUSTOMER.value,
-            "step_details": session["steps"]["1"],
+            "step_details": framework_service.get_current_step(project_id),
             "message": "Framework initialized. Let's start by understanding your market!"
         }
     except Exception as e:
@@ -67,7 +68,7 @@ async def initialize_sample_framework(project_id: str, idea: dict):
             "project_id": project_id,
             "current_step": session["current_step"],
             "current_phase": session["current_phase"],
-            "step_details": session["steps"][str(session["current_step"])],
+            "step_details": framework_service.get_current_step(project_id),
             "message": "Sample framework initialized with prefilled answers."
         }
     except Exception as e:
@@ -87,7 +88,7 @@ async def fast_track_framework(project_id: str, idea: dict):
             "project_id": project_id,
             "current_step": session["current_step"],
             "current_phase": session["current_phase"],
-            "step_details": session["steps"][str(session["current_step"])],
+            "step_details": framework_service.get_current_step(project_id),
             "message": "Framework fast-tracked. Required steps marked as skipped. Ready to develop.",
             "progress": framework_service.get_framework_progress(project_id),
         }
@@ -102,10 +103,11 @@ async def get_framework_session(project_id: str):
     if not session:
         raise HTTPException(status_code=404, detail="No framework session found")
     
-    return {
-        "session": session,
-        "progress": framework_service.get_framework_progress(project_id)
-    }
+    progress = framework_service.get_framework_progress(project_id)
+    return Response(
+        content=b'{"session":%b,"progress":%b}' % (serialize_session(session), orjson.dumps(progress)),
+        media_type="application/json"
+    )
 
 
 @router.get("/step/{project_id}")
@@ -128,11 +130,11 @@ async def get_step_details(project_id: str, step_number: int):
     if not session:
         raise HTTPException(status_code=404, detail="No framework session found")
     
-    step_key = str(step_number)
-    if step_key not in session["steps"]:
+    step = framework_service.get_step(project_id, step_number)
+    if not step:
         raise HTTPException(status_code=404, detail="Invalid step number")
     
-    return {"step": session["steps"][step_key]}
+    return {"step": step}
 
 
 @router.post("/step/{project_id}/complete")
@@ -5,7 +5,7 @@ Git routes for version control operations.
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
-from services.git_service import git_service
+from services.git_service import UntrackedMode, git_service
 
 router = APIRouter(prefix="/api/git", tags=["git"])
 
@@ -31,6 +31,11 @@ class DiscardRequest(BaseModel):
     files: Optional[List[str]] = None
 
 
+class StatusManyRequest(BaseModel):
+    """Request for the status of several projects."""
+    project_ids: List[str]
+
+
 @router.post("/{project_id}/init")
 async def init_repository(project_id: str):
     """Initialize a git repository for the project."""
@@ -42,7 +47,7 @@ async def init_repository(project_id: str):
 
 
 @router.get("/{project_id}/status")
-async def get_status(project_id: str):
+async def get_status(project_id: str, untracked: UntrackedMode = "normal"):
     """Get the current git status."""
     if not git_service.is_git_repo(project_id):
         return {
@@ -51,7 +56,7 @@ async def get_status(project_id: str):
             "message": "Not a git repository"
         }
     
-    status = git_service.get_status(project_id)
+    status = git_service.get_status(project_id, untracked)
     current_branch = git_service.get_current_branch(project_id)
     
     return {
@@ -62,6 +67,34 @@ async def get_status(project_id: str):
     }
 
 
+@router.post("/status")
+def get_status_many(request: StatusManyRequest):
+    """Get the git status of several projects at once (dashboard view)."""
+    project_ids = list(dict.fromkeys(request.project_ids))
+    statuses = git_service.get_status_many(project_ids)
+    branches = git_service.get_current_branch_many(project_ids)
+    
+    projects = {}
+    for project_id in project_ids:
+        status = statuses[project_id]
+        if "error" in status:
+            projects[project_id] = {
+                "is_repo": False,
+                "message": status["error"]
+            }
+        else:
+            projects[project_id] = {
+                "is_repo": True,
+                "branch": branches[project_id],
+                **status
+            }
+    
+    return {
+        "success": True,
+        "projects": projects
+    }
+
+
 @router.post("/{project_id}/add")
 async def stage_files(project_id: str, request: AddFilesRequest):
     """Stage files for commit."""
@@ -93,7 +126,7 @@ async def create_commit(project_id: str, request: CommitRequest):
 @router.get("/{project_id}/log")
 async def get_commit_log(project_id: str, limit: int = 50):
     """Get commit history."""
-    commits = git_service.get_log(project_id, limit)
+    commits = list(git_service.get_log(project_id, limit))
     
     return {
         "success": True,
@@ -6,12 +6,30 @@ pull requests, issues, actions, and collaboration.
 """
 
 from fastapi import APIRouter, HTTPException, Query, Body
-from typing import Optional, List, Dict
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Optional, List, Dict
 from services.github_service import github_service
 
 router = APIRouter(prefix="/api/github", tags=["github"])
 
 
+async def _stream_response(chunks: AsyncIterator[bytes], media_type: str) -> StreamingResponse:
+    """Start a GitHub download and stream it, failing with 400 before any bytes are sent."""
+    try:
+        first = await chunks.__anext__()
+    except StopAsyncIteration:
+        first = b""
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def body():
+        yield first
+        async for chunk in chunks:
+            yield chunk
+    
+    return StreamingResponse(body(), media_type=media_type)
+
+
 # ============== AUTH & USER ==============
 
 @router.post("/auth/token")
@@ -340,6 +358,25 @@ async def get_contents(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/repos/{owner}/{repo}/raw")
+async def get_raw_file(
+    owner: str,
+    repo: str,
+    path: str,
+    user_id: str = Query(...),
+    ref: Optional[str] = None
+):
+    """Stream a file's raw content without buffering it."""
+    token = github_service.get_token(user_id)
+    if not token:
+        raise HTTPException(status_code=400, detail="No token found for user")
+    
+    return await _stream_response(
+        github_service.stream_contents(token, owner, repo, path, ref),
+        "application/octet-stream"
+    )
+
+
 @router.put("/repos/{owner}/{repo}/contents/{path:path}")
 async def create_or_update_file(
     owner: str,
@@ -762,6 +799,19 @@ async def list_workflow_jobs(owner: str, repo: str, run_id: int, user_id: str =
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/repos/{owner}/{repo}/actions/runs/{run_id}/logs")
+async def download_workflow_logs(owner: str, repo: str, run_id: int, user_id: str = Query(...)):
+    """Stream the zipped logs of a workflow run."""
+    token = github_service.get_token(user_id)
+    if not token:
+        raise HTTPException(status_code=400, detail="No token found for user")
+    
+    return await _stream_response(
+        github_service.stream_workflow_logs(token, owner, repo, run_id),
+        "application/zip"
+    )
+
+
 # ============== RELEASES ==============
 
 @router.get("/repos/{owner}/{repo}/releases")
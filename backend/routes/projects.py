@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from models.schemas import Project, ProjectCreate
 from models.database import get_db, User, DBProject
 from services import code_generator
+from services.git_service import git_service
 from utils.auth import get_current_active_user
 import shutil
 import tempfile
@@ -28,6 +29,7 @@ async def create_project(
             tech_stack=project_data.tech_stack,
             ai_provider=project_data.ai_provider
         )
+        git_service.invalidate(project.id)
         
         # Save project to database with user association
         db_project = DBProject(
@@ -229,6 +231,7 @@ async def delete_project(
         project_path = code_generator.projects_path / project_id
         if project_path.exists():
             shutil.rmtree(project_path)
+        git_service.invalidate(project_id)
         
         # Remove from in-memory cache
         if project_id in code_generator.projects_db:
@@ -0,0 +1,269 @@
+"""
+Import scanners behind dependency detection.
+
+Kept free of service and config imports (only the stdlib and cachetools,
+which ships type hints), and fully annotated, so the module passes
+mypy --strict and can be compiled with mypyc (run from backend/):
+
+    mypyc services/_dep_scan.py
+
+The compiled extension is picked up in place of this file automatically.
+"""
+
+import hashlib
+import re
+import sys
+import threading
+from types import MappingProxyType
+from typing import Callable, Dict, Final, FrozenSet, Iterator, Mapping, Pattern, Set, Tuple, Union
+
+from cachetools import LRUCache
+
+
+# Standard library modules (no install needed)
+_PY_STDLIB: Final[FrozenSet[str]] = frozenset({
+    'os', 'sys', 'json', 'datetime', 're',
+    'pathlib', 'typing', 'collections', 'functools',
+    'itertools', 'math', 'random', 'time',
+    'asyncio', 'threading', 'subprocess', 'io',
+    'hashlib', 'base64', 'urllib', 'http',
+})
+
+# Common package mappings (import name -> package name)
+_PYTHON_PACKAGE_MAPPINGS: Dict[str, str] = {
+    'fastapi': 'fastapi',
+    'uvicorn': 'uvicorn',
+    'pydantic': 'pydantic',
+    'requests': 'requests',
+    'httpx': 'httpx',
+    'aiohttp': 'aiohttp',
+    'flask': 'flask',
+    'django': 'django',
+    'numpy': 'numpy',
+    'pandas': 'pandas',
+    'scipy': 'scipy',
+    'matplotlib': 'matplotlib',
+    'seaborn': 'seaborn',
+    'sklearn': 'scikit-learn',
+    'tensorflow': 'tensorflow',
+    'torch': 'torch',
+    'transformers': 'transformers',
+    'openai': 'openai',
+    'anthropic': 'anthropic',
+    'chromadb': 'chromadb',
+    'sqlalchemy': 'sqlalchemy',
+    'alembic': 'alembic',
+    'pytest': 'pytest',
+    'redis': 'redis',
+    'celery': 'celery',
+    'boto3': 'boto3',
+    'pillow': 'Pillow',
+    'PIL': 'Pillow',
+    'cv2': 'opencv-python',
+    'bs4': 'beautifulsoup4',
+    'lxml': 'lxml',
+    'yaml': 'pyyaml',
+    'dotenv': 'python-dotenv',
+    'jwt': 'PyJWT',
+    'bcrypt': 'bcrypt',
+    'passlib': 'passlib',
+    'slowapi': 'slowapi',
+    'websockets': 'websockets',
+    'socketio': 'python-socketio',
+    'jinja2': 'Jinja2',
+    'markdown': 'markdown',
+    'rich': 'rich',
+    'click': 'click',
+    'typer': 'typer',
+    'streamlit': 'streamlit',
+    'gradio': 'gradio',
+}
+
+# JavaScript/TypeScript import to package mapping
+_JS_PACKAGE_MAPPINGS: Dict[str, str] = {
+    'react': 'react',
+    'react-dom': 'react-dom',
+    'next': 'next',
+    'vue': 'vue',
+    'svelte': 'svelte',
+    'express': 'express',
+    'axios': 'axios',
+    'lodash': 'lodash',
+    'moment': 'moment',
+    'dayjs': 'dayjs',
+    'date-fns': 'date-fns',
+    'uuid': 'uuid',
+    'zod': 'zod',
+    'yup': 'yup',
+    'formik': 'formik',
+    'react-hook-form': 'react-hook-form',
+    'tailwindcss': 'tailwindcss',
+    'styled-components': 'styled-components',
+    '@emotion/react': '@emotion/react',
+    '@emotion/styled': '@emotion/styled',
+    'framer-motion': 'framer-motion',
+    'gsap': 'gsap',
+    'three': 'three',
+    'd3': 'd3',
+    'chart.js': 'chart.js',
+    'recharts': 'recharts',
+    'socket.io': 'socket.io',
+    'socket.io-client': 'socket.io-client',
+    'mongoose': 'mongoose',
+    'prisma': '@prisma/client',
+    'typeorm': 'typeorm',
+    'sequelize': 'sequelize',
+    'bcryptjs': 'bcryptjs',
+    'jsonwebtoken': 'jsonwebtoken',
+    'cors': 'cors',
+    'helmet': 'helmet',
+    'morgan': 'morgan',
+    'winston': 'winston',
+    'dotenv': 'dotenv',
+    'commander': 'commander',
+    'inquirer': 'inquirer',
+    'chalk': 'chalk',
+    'ora': 'ora',
+    'jest': 'jest',
+    'mocha': 'mocha',
+    'chai': 'chai',
+    'cypress': 'cypress',
+    'playwright': '@playwright/test',
+    'lucide-react': 'lucide-react',
+    '@radix-ui': '@radix-ui/react-icons',
+    'clsx': 'clsx',
+    'class-variance-authority': 'class-variance-authority',
+    'tailwind-merge': 'tailwind-merge',
+    'zustand': 'zustand',
+    'redux': 'redux',
+    'react-redux': 'react-redux',
+    '@reduxjs/toolkit': '@reduxjs/toolkit',
+    'react-query': '@tanstack/react-query',
+    'swr': 'swr',
+    'react-router': 'react-router-dom',
+    'react-router-dom': 'react-router-dom',
+}
+
+# Freeze the mapping tables as read-only views with interned strings, so
+# lookups in the scanners can short-circuit on identity
+PYTHON_PACKAGE_MAPPINGS: Final[Mapping[str, str]] = MappingProxyType({
+    sys.intern(k): sys.intern(v) for k, v in _PYTHON_PACKAGE_MAPPINGS.items()
+})
+JS_PACKAGE_MAPPINGS: Final[Mapping[str, str]] = MappingProxyType({
+    sys.intern(k): sys.intern(v) for k, v in _JS_PACKAGE_MAPPINGS.items()
+})
+
+# Import scanners, compiled once and each run over the whole source buffer
+# Python: 'import x' and 'from x import y'
+_PY_IMPORT_RES: Final[Tuple[Pattern[str], ...]] = (
+    re.compile(r'^\s*(?:import|from)\s+(\w+)', re.MULTILINE),
+)
+# JS/TS: 'import ... from "x"' (single line), 'import "x"', 'require("x")'
+# (relative paths starting with '.' or '/' are skipped)
+_JS_IMPORT_RES: Final[Tuple[Pattern[str], ...]] = (
+    re.compile(r'import\s+.*?\s+from\s+[\'"]([^\.\/][^\'"]+)[\'"]'),
+    re.compile(r'import\s+[\'"]([^\.\/][^\'"]+)[\'"]'),
+    re.compile(r'require\s*\(\s*[\'"]([^\.\/][^\'"]+)[\'"]\s*\)'),
+)
+# Byte-pattern twins for raw file contents: imports are ASCII, so sources
+# read from disk are scanned undecoded and only the matched names decoded
+_PY_IMPORT_RES_B: Final[Tuple[Pattern[bytes], ...]] = tuple(
+    re.compile(pattern.pattern.encode(), pattern.flags & re.MULTILINE) for pattern in _PY_IMPORT_RES
+)
+_JS_IMPORT_RES_B: Final[Tuple[Pattern[bytes], ...]] = tuple(
+    re.compile(pattern.pattern.encode()) for pattern in _JS_IMPORT_RES
+)
+
+
+def _match_names(
+    patterns: Tuple[Pattern[str], ...],
+    patterns_b: Tuple[Pattern[bytes], ...],
+    code: Union[str, bytes]
+) -> Iterator[str]:
+    """Yield the first group of every match, scanning bytes without decoding."""
+    if isinstance(code, bytes):
+        for pattern_b in patterns_b:
+            for m in pattern_b.finditer(code):
+                yield m.group(1).decode('utf-8', 'replace')
+    else:
+        for pattern in patterns:
+            for match in pattern.finditer(code):
+                yield match.group(1)
+
+
+# Scan results are cached by a digest of the source, so re-analyzing an
+# unchanged file (UI polling, repeated generate calls) skips the regex work
+# without the cache keeping the sources themselves alive
+_SCAN_CACHE_SIZE: Final[int] = 4096
+_ScanCache = LRUCache[Tuple[bool, bytes], FrozenSet[str]]  # (is_bytes, digest) -> packages
+_PY_SCAN_CACHE: Final[_ScanCache] = LRUCache(maxsize=_SCAN_CACHE_SIZE)
+_JS_SCAN_CACHE: Final[_ScanCache] = LRUCache(maxsize=_SCAN_CACHE_SIZE)
+_scan_cache_lock: Final[threading.Lock] = threading.Lock()
+
+
+def _cached_scan(
+    cache: _ScanCache,
+    scan: Callable[[Union[str, bytes]], FrozenSet[str]],
+    code: Union[str, bytes]
+) -> FrozenSet[str]:
+    """Run scan over code, reusing the result for identical sources."""
+    is_bytes = isinstance(code, bytes)
+    data = code if isinstance(code, bytes) else code.encode('utf-8', 'surrogatepass')
+    key = (is_bytes, hashlib.blake2b(data, digest_size=16).digest())
+    
+    with _scan_cache_lock:
+        result = cache.get(key)
+    if result is None:
+        result = scan(code)
+        with _scan_cache_lock:
+            cache[key] = result
+    return result
+
+
+def scan_python_imports(code: Union[str, bytes]) -> FrozenSet[str]:
+    """Return the package names imported by Python source (str or bytes)."""
+    return _cached_scan(_PY_SCAN_CACHE, _scan_python_imports, code)
+
+
+def scan_js_imports(code: Union[str, bytes]) -> FrozenSet[str]:
+    """Return the package names imported by JavaScript/TypeScript source (str or bytes)."""
+    return _cached_scan(_JS_SCAN_CACHE, _scan_js_imports, code)
+
+
+def _scan_python_imports(code: Union[str, bytes]) -> FrozenSet[str]:
+    """Scan Python source for imported package names (uncached)."""
+    imports: Set[str] = set()
+    
+    for module in _match_names(_PY_IMPORT_RES, _PY_IMPORT_RES_B, code):
+        if module in _PY_STDLIB:
+            continue
+        # Package name may differ from import name; unknown modules
+        # are added as-is
+        imports.add(PYTHON_PACKAGE_MAPPINGS.get(module, module))
+    
+    return frozenset(imports)
+
+
+def _scan_js_imports(code: Union[str, bytes]) -> FrozenSet[str]:
+    """Scan JavaScript/TypeScript source for imported package names (uncached)."""
+    imports: Set[str] = set()
+    
+    for match in _match_names(_JS_IMPORT_RES, _JS_IMPORT_RES_B, code):
+        # Handle scoped packages (@org/package)
+        if match.startswith('@'):
+            parts = match.split('/')
+            if len(parts) >= 2:
+                package = f"{parts[0]}/{parts[1]}"
+            else:
+                package = match
+        else:
+            # Get the base package name (before any subpath)
+            package = match.split('/')[0]
+        
+        # Map to actual package if known
+        if package in JS_PACKAGE_MAPPINGS:
+            imports.add(JS_PACKAGE_MAPPINGS[package])
+        else:
+            imports.add(package)
+    
+    return frozenset(imports)
@@ -170,6 +170,22 @@ class CodeGeneratorService:
         
         return files
     
+    def get_project_file_bytes(self, project_id: str) -> Dict[str, bytes]:
+        """Get the raw, undecoded contents of all files in a project by path."""
+        project = self.get_project(project_id)
+        if not project:
+            raise ValueError(f"Project {project_id} not found")
+        
+        project_path = self.projects_path / project_id
+        files = {}
+        
+        for file_path in project.files:
+            full_path = project_path / file_path
+            if full_path.exists():
+                files[file_path] = full_path.read_bytes()
+        
+        return files
+    
     def get_file_content(self, project_id: str, file_path: str) -> Optional[str]:
         """Get content of a specific file."""
         project_path = self.projects_path / project_id / file_path
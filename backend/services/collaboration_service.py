@@ -5,16 +5,33 @@ Service for team management, real-time collaboration,
 and communication features.
 """
 
-from typing import Dict, List, Optional, Set
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Set
 from datetime import datetime, timedelta
 from uuid import uuid4
+from cachetools import LRUCache
 from models.project_management import (
     TeamMember, TeamInvite, TeamRole,
     Channel, Message, MessageCreate, MessageType,
-    Notification, NotificationType
+    Notification, NotificationType,
+    _MANAGE_TEAM_ROLES
 )
 
 
+# Notification retention: a ring buffer per user, for a bounded number of users
+MAX_NOTIFICATIONS_PER_USER = 200
+MAX_NOTIFICATION_USERS = 10000
+
+# Typing indicators expire after this many seconds
+TYPING_TIMEOUT = 5.0
+# Only compact a channel's typing map once it grows past this size
+TYPING_COMPACT_THRESHOLD = 16
+
+
 class CollaborationService:
     """Service for team collaboration and communication."""
     
@@ -25,14 +42,42 @@ class CollaborationService:
         
         # Messaging
         self.channels: Dict[str, Dict[str, Channel]] = {}  # project_id -> {channel_id -> Channel}
-        self.messages: Dict[str, List[Message]] = {}  # channel_id -> [Message]
+        self.messages: Dict[str, List[Message]] = {}  # channel_id -> [Message] (ordered by seq)
+        self.message_seq: Dict[str, int] = {}  # message_id -> seq
+        self._next_seq: Dict[str, int] = {}  # channel_id -> last assigned seq
         
         # Notifications
-        self.notifications: Dict[str, List[Notification]] = {}  # user_id -> [Notification]
+        # user_id -> deque[Notification] (newest first), least recently used users evicted
+        self.notifications: LRUCache = LRUCache(maxsize=MAX_NOTIFICATION_USERS)
         
         # Online presence
         self.online_users: Dict[str, Set[str]] = {}  # project_id -> {user_ids}
-        self.user_typing: Dict[str, Dict[str, datetime]] = {}  # channel_id -> {user_id -> timestamp}
+        self.user_typing: Dict[str, Dict[str, float]] = {}  # channel_id -> {user_id -> monotonic expiry}
+        
+        # Lock sharding: writers only serialize against the same project
+        self._locks_guard = threading.Lock()
+        self._project_locks: Dict[str, threading.RLock] = {}  # project_id -> lock
+        # The notifications LRUCache reorders itself even on reads and evicts
+        # across users, so it and the buffers in it share this one lock
+        # (per-user locks would pile up for users the LRU already evicted)
+        self._notifications_lock = threading.Lock()
+    
+    def _project_lock(self, project_id: str) -> threading.RLock:
+        """Get the lock guarding a project's team/channel/message state."""
+        lock = self._project_locks.get(project_id)
+        if lock is None:
+            with self._locks_guard:
+                lock = self._project_locks.setdefault(project_id, threading.RLock())
+        return lock
+    
+    def _user_notifications(self, user_id: str, create: bool = False) -> Optional[Deque[Notification]]:
+        """Get a user's notification buffer, optionally creating it."""
+        with self._notifications_lock:
+            user_notifications = self.notifications.get(user_id)
+            if user_notifications is None and create:
+                user_notifications = deque(maxlen=MAX_NOTIFICATIONS_PER_USER)
+                self.notifications[user_id] = user_notifications
+        return user_notifications
     
     # ============== TEAM MANAGEMENT ==============
     
@@ -56,20 +101,17 @@ class CollaborationService:
             full_name=full_name,
             avatar_url=avatar_url,
             role=role,
-            can_edit_tasks=role != TeamRole.VIEWER,
-            can_manage_sprints=role in [TeamRole.OWNER, TeamRole.ADMIN, TeamRole.PRODUCT_MANAGER],
-            can_manage_team=role in [TeamRole.OWNER, TeamRole.ADMIN],
-            can_delete_project=role == TeamRole.OWNER,
             joined_at=datetime.now()
         )
         
-        if project_id not in self.team_members:
-            self.team_members[project_id] = {}
-        
-        self.team_members[project_id][user_id] = member
-        
-        # Create default channel membership
-        self._add_to_default_channels(project_id, user_id)
+        with self._project_lock(project_id):
+            if project_id not in self.team_members:
+                self.team_members[project_id] = {}
+            
+            self.team_members[project_id][user_id] = member
+            
+            # Create default channel membership
+            self._add_to_default_channels(project_id, user_id)
         
         return member
     
@@ -99,13 +141,11 @@ class CollaborationService:
         
         # Check permissions
         updater = self.get_team_member(project_id, updated_by)
-        if not updater or not updater.can_manage_team:
+        if not updater or updater.role not in _MANAGE_TEAM_ROLES:
             return None
         
-        member.role = new_role
-        member.can_edit_tasks = new_role != TeamRole.VIEWER
-        member.can_manage_sprints = new_role in [TeamRole.OWNER, TeamRole.ADMIN, TeamRole.PRODUCT_MANAGER]
-        member.can_manage_team = new_role in [TeamRole.OWNER, TeamRole.ADMIN]
+        with self._project_lock(project_id):
+            member.role = new_role
         
         return member
     
@@ -121,7 +161,7 @@ class CollaborationService:
         
         # Check permissions
         remover = self.get_team_member(project_id, removed_by)
-        if not remover or not remover.can_manage_team:
+        if not remover or remover.role not in _MANAGE_TEAM_ROLES:
             return False
         
         # Cannot remove owner
@@ -129,9 +169,10 @@ class CollaborationService:
         if member and member.role == TeamRole.OWNER:
             return False
         
-        if user_id in self.team_members[project_id]:
-            del self.team_members[project_id][user_id]
-            return True
+        with self._project_lock(project_id):
+            if user_id in self.team_members[project_id]:
+                del self.team_members[project_id][user_id]
+                return True
         
         return False
     
@@ -155,10 +196,11 @@ class CollaborationService:
             expires_at=datetime.now() + timedelta(days=7)
         )
         
-        if project_id not in self.team_invites:
-            self.team_invites[project_id] = []
-        
-        self.team_invites[project_id].append(invite)
+        with self._project_lock(project_id):
+            if project_id not in self.team_invites:
+                self.team_invites[project_id] = []
+            
+            self.team_invites[project_id].append(invite)
         
         return invite
     
@@ -224,18 +266,19 @@ class CollaborationService:
             name=name,
             description=description,
             is_private=is_private,
-            member_ids=member_ids or [],
+            member_ids=set(member_ids or ()),
             created_at=datetime.now(),
             created_by=created_by
         )
         
-        if project_id not in self.channels:
-            self.channels[project_id] = {}
-        
-        self.channels[project_id][channel_id] = channel
-        
-        # Initialize message list
-        self.messages[channel_id] = []
+        with self._project_lock(project_id):
+            if project_id not in self.channels:
+                self.channels[project_id] = {}
+            
+            self.channels[project_id][channel_id] = channel
+            
+            # Initialize message list
+            self.messages[channel_id] = []
         
         return channel
     
@@ -246,29 +289,30 @@ class CollaborationService:
         user2_id: str
     ) -> Channel:
         """Create a direct message channel between two users."""
-        # Check if channel already exists
-        existing = self._find_direct_channel(project_id, user1_id, user2_id)
-        if existing:
-            return existing
-        
-        channel_id = f"DM-{uuid4().hex[:8]}"
-        
-        channel = Channel(
-            id=channel_id,
-            project_id=project_id,
-            name=f"dm-{user1_id}-{user2_id}",
-            is_direct=True,
-            is_private=True,
-            member_ids=[user1_id, user2_id],
-            created_at=datetime.now(),
-            created_by=user1_id
-        )
-        
-        if project_id not in self.channels:
-            self.channels[project_id] = {}
-        
-        self.channels[project_id][channel_id] = channel
-        self.messages[channel_id] = []
+        with self._project_lock(project_id):
+            # Check if channel already exists
+            existing = self._find_direct_channel(project_id, user1_id, user2_id)
+            if existing:
+                return existing
+            
+            channel_id = f"DM-{uuid4().hex[:8]}"
+            
+            channel = Channel(
+                id=channel_id,
+                project_id=project_id,
+                name=f"dm-{user1_id}-{user2_id}",
+                is_direct=True,
+                is_private=True,
+                member_ids={user1_id, user2_id},
+                created_at=datetime.now(),
+                created_by=user1_id
+            )
+            
+            if project_id not in self.channels:
+                self.channels[project_id] = {}
+            
+            self.channels[project_id][channel_id] = channel
+            self.messages[channel_id] = []
         
         return channel
     
@@ -282,9 +326,10 @@ class CollaborationService:
         if project_id not in self.channels:
             return None
         
+        members = {user1_id, user2_id}
         for channel in self.channels[project_id].values():
             if channel.is_direct:
-                if set(channel.member_ids) == {user1_id, user2_id}:
+                if channel.member_ids == members:
                     return channel
         
         return None
@@ -321,8 +366,8 @@ class CollaborationService:
         
         # Add to all public channels
         for channel in self.channels[project_id].values():
-            if not channel.is_private and user_id not in channel.member_ids:
-                channel.member_ids.append(user_id)
+            if not channel.is_private:
+                channel.member_ids.add(user_id)
     
     # ============== MESSAGING ==============
     
@@ -353,21 +398,29 @@ class CollaborationService:
             created_at=datetime.now()
         )
         
-        if channel_id not in self.messages:
-            self.messages[channel_id] = []
-        
-        self.messages[channel_id].append(message)
-        
-        # Update channel last message time
-        channel = self.get_channel(project_id, channel_id)
-        if channel:
-            channel.last_message_at = message.created_at
-        
-        # Update reply count if this is a thread reply
-        if message_data.thread_id:
-            parent = self._get_message(channel_id, message_data.thread_id)
-            if parent:
-                parent.reply_count += 1
+        # Assign the seq and append under one lock so the channel list
+        # stays in seq order for the bisects in get_messages/_get_message
+        with self._project_lock(project_id):
+            seq = self._next_seq.get(channel_id, 0) + 1
+            self._next_seq[channel_id] = seq
+            message.seq = seq
+            
+            if channel_id not in self.messages:
+                self.messages[channel_id] = []
+            
+            self.messages[channel_id].append(message)
+            self.message_seq[message_id] = seq
+            
+            # Update channel last message time
+            channel = self.get_channel(project_id, channel_id)
+            if channel:
+                channel.last_message_at = message.created_at
+            
+            # Update reply count if this is a thread reply
+            if message_data.thread_id:
+                parent = self._get_message(channel_id, message_data.thread_id)
+                if parent:
+                    parent.reply_count += 1
         
         # Create notifications for mentions
         for mentioned_user in message_data.mentions:
@@ -398,37 +451,50 @@ class CollaborationService:
         
         messages = self.messages[channel_id]
         
-        # Filter by thread
-        if thread_id:
-            messages = [m for m in messages if m.thread_id == thread_id]
-        else:
-            # Only get top-level messages (not thread replies)
-            messages = [m for m in messages if not m.thread_id]
-        
-        # Filter deleted
-        messages = [m for m in messages if not m.deleted]
-        
-        # Sort by time (newest last)
-        messages = sorted(messages, key=lambda m: m.created_at)
-        
-        # Pagination
+        # Pagination (messages are stored in seq order, newest last)
+        end = len(messages)
         if before:
-            before_idx = next(
-                (i for i, m in enumerate(messages) if m.id == before),
-                len(messages)
-            )
-            messages = messages[:before_idx]
-        
-        return messages[-limit:]
+            # Seqs are per channel, so check the cursor really is this message;
+            # like the old list scan, a cursor outside the filtered view
+            # (other channel, deleted, other thread) is ignored
+            before_seq = self.message_seq.get(before)
+            if before_seq is not None:
+                idx = bisect_left(messages, before_seq, key=lambda m: m.seq)
+                if idx < len(messages) and messages[idx].id == before:
+                    cursor = messages[idx]
+                    in_view = cursor.thread_id == thread_id if thread_id else not cursor.thread_id
+                    if in_view and not cursor.deleted:
+                        end = idx
+        
+        # Walk back from the cursor until the page is full
+        page = []
+        for i in range(end - 1, -1, -1):
+            m = messages[i]
+            if m.deleted:
+                continue
+            # Thread replies only, or top-level messages only
+            if thread_id:
+                if m.thread_id != thread_id:
+                    continue
+            elif m.thread_id:
+                continue
+            page.append(m)
+            if len(page) == limit:
+                break
+        
+        page.reverse()
+        return page
     
     def _get_message(self, channel_id: str, message_id: str) -> Optional[Message]:
         """Get a specific message."""
-        if channel_id not in self.messages:
+        seq = self.message_seq.get(message_id)
+        if seq is None or channel_id not in self.messages:
             return None
         
-        for msg in self.messages[channel_id]:
-            if msg.id == message_id:
-                return msg
+        messages = self.messages[channel_id]
+        idx = bisect_left(messages, seq, key=lambda m: m.seq)
+        if idx < len(messages) and messages[idx].id == message_id:
+            return messages[idx]
         return None
     
     def edit_message(
@@ -510,28 +576,22 @@ class CollaborationService:
         """Set user as typing in a channel."""
         if channel_id not in self.user_typing:
             self.user_typing[channel_id] = {}
-        self.user_typing[channel_id][user_id] = datetime.now()
+        self.user_typing[channel_id][user_id] = time.monotonic() + TYPING_TIMEOUT
     
     def get_typing_users(self, channel_id: str) -> List[str]:
         """Get users currently typing in a channel."""
-        if channel_id not in self.user_typing:
+        users = self.user_typing.get(channel_id)
+        if not users:
             return []
         
-        now = datetime.now()
-        typing_users = []
-        expired = []
-        
-        for user_id, timestamp in self.user_typing[channel_id].items():
-            if (now - timestamp).seconds < 5:  # 5 second timeout
-                typing_users.append(user_id)
-            else:
-                expired.append(user_id)
+        now = time.monotonic()
         
-        # Clean up expired
-        for user_id in expired:
-            del self.user_typing[channel_id][user_id]
+        # Expired entries are ignored on read; only compact large maps
+        if len(users) > TYPING_COMPACT_THRESHOLD:
+            for user_id in [u for u, expires in users.items() if expires <= now]:
+                del users[user_id]
         
-        return typing_users
+        return [u for u, expires in users.items() if expires > now]
     
     # ============== NOTIFICATIONS ==============
     
@@ -562,13 +622,10 @@ class CollaborationService:
             created_at=datetime.now()
         )
         
-        if user_id not in self.notifications:
-            self.notifications[user_id] = []
-        
-        self.notifications[user_id].insert(0, notification)
-        
-        # Keep only last 200 notifications
-        self.notifications[user_id] = self.notifications[user_id][:200]
+        user_notifications = self._user_notifications(user_id, create=True)
+        with self._notifications_lock:
+            # Oldest notification falls off the end once the buffer is full
+            user_notifications.appendleft(notification)
         
         return notification
     
@@ -579,49 +636,55 @@ class CollaborationService:
         unread_only: bool = False
     ) -> List[Notification]:
         """Get notifications for a user."""
-        if user_id not in self.notifications:
+        notifications = self._user_notifications(user_id)
+        if notifications is None:
             return []
         
-        notifications = self.notifications[user_id]
-        
-        if unread_only:
-            notifications = [n for n in notifications if not n.read]
-        
-        return notifications[:limit]
+        with self._notifications_lock:
+            if unread_only:
+                return list(islice((n for n in notifications if not n.read), limit))
+            
+            return list(islice(notifications, limit))
     
     def mark_notification_read(self, user_id: str, notification_id: str) -> bool:
         """Mark a notification as read."""
-        if user_id not in self.notifications:
+        notifications = self._user_notifications(user_id)
+        if notifications is None:
             return False
         
-        for notification in self.notifications[user_id]:
-            if notification.id == notification_id:
-                notification.read = True
-                notification.read_at = datetime.now()
-                return True
+        with self._notifications_lock:
+            for notification in notifications:
+                if notification.id == notification_id:
+                    notification.read = True
+                    notification.read_at = datetime.now()
+                    return True
         
         return False
     
     def mark_all_notifications_read(self, user_id: str) -> int:
         """Mark all notifications as read. Returns count marked."""
-        if user_id not in self.notifications:
+        notifications = self._user_notifications(user_id)
+        if notifications is None:
             return 0
         
         count = 0
         now = datetime.now()
-        for notification in self.notifications[user_id]:
-            if not notification.read:
-                notification.read = True
-                notification.read_at = now
-                count += 1
+        with self._notifications_lock:
+            for notification in notifications:
+                if not notification.read:
+                    notification.read = True
+                    notification.read_at = now
+                    count += 1
         
         return count
     
     def get_unread_count(self, user_id: str) -> int:
         """Get unread notification count."""
-        if user_id not in self.notifications:
+        notifications = self._user_notifications(user_id)
+        if notifications is None:
             return 0
-        return len([n for n in self.notifications[user_id] if not n.read])
+        with self._notifications_lock:
+            return sum(1 for n in notifications if not n.read)
     
     # ============== PRESENCE ==============
     
@@ -8,25 +8,79 @@ This service enables context-aware suggestions by:
 4. Providing relevant context to AI prompts
 """
 
-import json
-from typing import Dict, List, Optional
+import atexit
+import io
+import os
+import re
+import sqlite3
+import threading
+import time
+import orjson
+from typing import Dict, List, Optional, Set, Tuple
 from datetime import datetime
 from pathlib import Path
 from services import chroma_service
 from config import settings
 
 
+# Seconds between a context mutation and its write to disk
+FLUSH_INTERVAL = 2.0
+
+# Keywords that indicate decisions
+DECISION_KEYWORDS = {
+    'framework': ['using', 'chose', 'selected', 'framework', 'library'],
+    'database': ['database', 'chromadb', 'storage', 'data'],
+    'architecture': ['structure', 'architecture', 'pattern', 'design'],
+    'styling': ['css', 'tailwind', 'styling', 'theme'],
+    'api': ['api', 'endpoint', 'route', 'rest'],
+}
+_DECISION_TYPE_BY_KEYWORD = {
+    keyword: decision_type
+    for decision_type, keywords in DECISION_KEYWORDS.items()
+    for keyword in keywords
+}
+# All keywords in one pattern; the lookahead tries every position so
+# overlapping keywords (e.g. 'rest' in 'restructure') are all seen.
+# ASCII-only case folding: Unicode folding would match text like 'uſing'
+# whose .lower() is not a keyword
+_DECISION_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, _DECISION_TYPE_BY_KEYWORD)) + "))",
+    re.IGNORECASE | re.ASCII
+)
+
 class ProjectContext:
     """Represents the context of a project for AI awareness."""
     
+    __slots__ = (
+        'project_id', 'tech_stack', 'file_structure', 'decisions', 'patterns',
+        'conversation_summary', 'last_updated', 'version', '_patterns_set',
+        '_prompt_cache',
+    )
+    
     def __init__(self, project_id: str):
         self.project_id = project_id
         self.tech_stack: Dict[str, str] = {}
         self.file_structure: List[str] = []
         self.decisions: List[Dict] = []
         self.patterns: List[str] = []
+        self._patterns_set: Set[str] = set()  # mirrors patterns for O(1) dedupe
         self.conversation_summary: str = ""
-        self.last_updated: datetime = datetime.now()
+        self.last_updated: int = time.time_ns()  # epoch nanoseconds
+        # Bumped on every mutation; unlike last_updated it can't repeat
+        # when two updates land in the same clock tick
+        self.version: int = 0
+        # include_files -> (version, rendered prompt)
+        self._prompt_cache: Dict[bool, Tuple[int, str]] = {}
+    
+    def touch(self, now: Optional[int] = None) -> None:
+        """Record a mutation (now is epoch nanoseconds, default current time)."""
+        self.last_updated = time.time_ns() if now is None else now
+        self.version += 1
+    
+    @property
+    def last_updated_at(self) -> datetime:
+        """last_updated as a local datetime, for serialization."""
+        return datetime.fromtimestamp(self.last_updated / 1e9)
 
 
 class ContextService:
@@ -37,6 +91,30 @@ class ContextService:
         self.contexts: Dict[str, ProjectContext] = {}
         self.context_path = Path(settings.projects_path) / ".contexts"
         self.context_path.mkdir(parents=True, exist_ok=True)
+        
+        # Write-behind: mutations mark a project dirty and a timer flushes
+        # all dirty contexts together instead of rewriting on every change
+        self._dirty: Set[str] = set()
+        self._dirty_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Timer] = None
+        atexit.register(self.flush)
+        
+        # All projects share one SQLite database in WAL mode; the connection
+        # is used from the flush timer thread too, so access is serialized
+        self._db = sqlite3.connect(
+            str(self.context_path / "contexts.db"),
+            isolation_level=None,
+            check_same_thread=False
+        )
+        self._db_lock = threading.Lock()
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS contexts (id TEXT PRIMARY KEY, blob BLOB, updated INT)"
+        )
+        self._db.execute("CREATE TABLE IF NOT EXISTS decisions (project_id TEXT, blob BLOB)")
+        self._db.execute(
+            "CREATE INDEX IF NOT EXISTS decisions_project ON decisions (project_id)"
+        )
     
     def get_project_context(self, project_id: str) -> ProjectContext:
         """Get or create context for a project."""
@@ -54,15 +132,15 @@ class ContextService:
         """Update the file structure for a project."""
         context = self.get_project_context(project_id)
         context.file_structure = files
-        context.last_updated = datetime.now()
-        self._save_context(context)
+        context.touch()
+        self._mark_dirty(context)
     
     def update_tech_stack(self, project_id: str, tech_stack: Dict[str, str]) -> None:
         """Update the tech stack decisions for a project."""
         context = self.get_project_context(project_id)
         context.tech_stack.update(tech_stack)
-        context.last_updated = datetime.now()
-        self._save_context(context)
+        context.touch()
+        self._mark_dirty(context)
     
     def add_decision(
         self, 
@@ -81,14 +159,24 @@ class ContextService:
             rationale: Why this decision was made
         """
         context = self.get_project_context(project_id)
-        context.decisions.append({
+        now = time.time_ns()
+        decision = {
             "type": decision_type,
             "description": description,
             "rationale": rationale,
-            "timestamp": datetime.now().isoformat()
-        })
-        context.last_updated = datetime.now()
-        self._save_context(context)
+            "timestamp": datetime.fromtimestamp(now / 1e9).isoformat()
+        }
+        context.decisions.append(decision)
+        
+        # Decisions are append-only: insert just the new row
+        with self._db_lock:
+            self._db.execute(
+                "INSERT INTO decisions (project_id, blob) VALUES (?, ?)",
+                (project_id, orjson.dumps(decision))
+            )
+        
+        context.touch(now)
+        self._mark_dirty(context)
         
         # Also store in ChromaDB for semantic search
         chroma_service.add_code_snippet(
@@ -101,17 +189,20 @@ class ContextService:
     def add_pattern(self, project_id: str, pattern: str) -> None:
         """Add a code pattern or convention used in the project."""
         context = self.get_project_context(project_id)
-        if pattern not in context.patterns:
-            context.patterns.append(pattern)
-            context.last_updated = datetime.now()
-            self._save_context(context)
+        if pattern in context._patterns_set:
+            return
+        
+        context._patterns_set.add(pattern)
+        context.patterns.append(pattern)
+        context.touch()
+        self._mark_dirty(context)
     
     def update_conversation_summary(self, project_id: str, summary: str) -> None:
         """Update the conversation summary for context."""
         context = self.get_project_context(project_id)
         context.conversation_summary = summary
-        context.last_updated = datetime.now()
-        self._save_context(context)
+        context.touch()
+        self._mark_dirty(context)
     
     def build_context_prompt(self, project_id: str, include_files: bool = True) -> str:
         """
@@ -122,48 +213,56 @@ class ContextService:
         """
         context = self.get_project_context(project_id)
         
-        parts = []
+        # Reuse the last render while the context is unchanged
+        cached = context._prompt_cache.get(include_files)
+        if cached and cached[0] == context.version:
+            return cached[1]
+        
+        buf = io.StringIO()
+        write = buf.write
         
         # Project overview
-        parts.append("=== PROJECT CONTEXT ===")
-        parts.append(f"Project ID: {project_id}")
+        write("=== PROJECT CONTEXT ===\n")
+        write(f"Project ID: {project_id}\n")
         
         # Tech stack
         if context.tech_stack:
-            parts.append("\n--- Tech Stack ---")
+            write("\n--- Tech Stack ---\n")
             for key, value in context.tech_stack.items():
-                parts.append(f"- {key}: {value}")
+                write(f"- {key}: {value}\n")
         
         # File structure
         if include_files and context.file_structure:
-            parts.append("\n--- Current Files ---")
+            write("\n--- Current Files ---\n")
             for file in context.file_structure[:20]:  # Limit to 20 files
-                parts.append(f"- {file}")
+                write(f"- {file}\n")
             if len(context.file_structure) > 20:
-                parts.append(f"... and {len(context.file_structure) - 20} more files")
+                write(f"... and {len(context.file_structure) - 20} more files\n")
         
         # Recent decisions
         if context.decisions:
-            parts.append("\n--- Previous Decisions ---")
+            write("\n--- Previous Decisions ---\n")
             for decision in context.decisions[-5:]:  # Last 5 decisions
-                parts.append(f"- [{decision['type']}] {decision['description']}")
+                write(f"- [{decision['type']}] {decision['description']}\n")
                 if decision.get('rationale'):
-                    parts.append(f"  Reason: {decision['rationale']}")
+                    write(f"  Reason: {decision['rationale']}\n")
         
         # Patterns
         if context.patterns:
-            parts.append("\n--- Code Patterns & Conventions ---")
+            write("\n--- Code Patterns & Conventions ---\n")
             for pattern in context.patterns[-5:]:
-                parts.append(f"- {pattern}")
+                write(f"- {pattern}\n")
         
         # Conversation context
         if context.conversation_summary:
-            parts.append("\n--- Conversation Context ---")
-            parts.append(context.conversation_summary)
+            write("\n--- Conversation Context ---\n")
+            write(f"{context.conversation_summary}\n")
         
-        parts.append("\n=== END CONTEXT ===")
+        write("\n=== END CONTEXT ===")
         
-        return "\n".join(parts)
+        prompt = buf.getvalue()
+        context._prompt_cache[include_files] = (context.version, prompt)
+        return prompt
     
     def get_suggestions(self, project_id: str, current_message: str) -> List[str]:
         """
@@ -179,12 +278,26 @@ class ContextService:
             suggestions.append("Start by describing what you want to build")
             suggestions.append("Create your first file")
         else:
-            has_html = any(f.endswith('.html') for f in context.file_structure)
-            has_css = any(f.endswith('.css') for f in context.file_structure)
-            has_js = any(f.endswith('.js') for f in context.file_structure)
-            has_py = any(f.endswith('.py') for f in context.file_structure)
-            has_tests = any('test' in f.lower() for f in context.file_structure)
-            has_readme = any('readme' in f.lower() for f in context.file_structure)
+            # Classify all files in a single pass
+            has_html = has_css = has_js = has_py = has_tests = has_readme = False
+            for f in context.file_structure:
+                if f.endswith('.html'):
+                    has_html = True
+                elif f.endswith('.css'):
+                    has_css = True
+                elif f.endswith('.js'):
+                    has_js = True
+                elif f.endswith('.py'):
+                    has_py = True
+                
+                lower = f.lower()
+                if 'test' in lower:
+                    has_tests = True
+                if 'readme' in lower:
+                    has_readme = True
+                
+                if has_html and has_css and has_js and has_py and has_tests and has_readme:
+                    break
             
             # Suggest missing components
             if has_html and not has_css:
@@ -225,82 +338,179 @@ class ContextService:
         
         Returns a list of decisions found in the exchange.
         """
-        decisions = []
-        
-        # Keywords that indicate decisions
-        decision_keywords = {
-            'framework': ['using', 'chose', 'selected', 'framework', 'library'],
-            'database': ['database', 'chromadb', 'storage', 'data'],
-            'architecture': ['structure', 'architecture', 'pattern', 'design'],
-            'styling': ['css', 'tailwind', 'styling', 'theme'],
-            'api': ['api', 'endpoint', 'route', 'rest'],
-        }
+        # Scan each text in place (case-insensitively) rather than building
+        # a lowercased copy of message + response; no keyword contains a
+        # space, so matches can never straddle the two
+        found_types = set()
+        for text in (message, response):
+            for match in _DECISION_RE.finditer(text):
+                found_types.add(_DECISION_TYPE_BY_KEYWORD[match.group(1).lower()])
+                if len(found_types) == len(DECISION_KEYWORDS):
+                    break
         
-        combined_text = (message + " " + response).lower()
+        return [
+            {"type": decision_type, "detected": True}
+            for decision_type in DECISION_KEYWORDS
+            if decision_type in found_types
+        ]
+    
+    def _mark_dirty(self, context: ProjectContext) -> None:
+        """Schedule a context to be written on the next flush."""
+        with self._dirty_lock:
+            self._dirty.add(context.project_id)
+            if self._flush_timer is None:
+                self._flush_timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush(self) -> None:
+        """Write every context modified since the last flush to disk."""
+        with self._dirty_lock:
+            dirty, self._dirty = self._dirty, set()
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
         
-        for decision_type, keywords in decision_keywords.items():
-            for keyword in keywords:
-                if keyword in combined_text:
-                    # Extract a brief description
-                    decisions.append({
-                        "type": decision_type,
-                        "detected": True
-                    })
-                    break
+        contexts = []
+        for project_id in dirty:
+            context = self.contexts.get(project_id)
+            if context:
+                contexts.append(context)
         
-        return decisions
+        if contexts:
+            self._save_contexts(contexts)
     
-    def _save_context(self, context: ProjectContext) -> None:
-        """Save context to disk."""
-        file_path = self.context_path / f"{context.project_id}.json"
-        
-        data = {
-            "project_id": context.project_id,
-            "tech_stack": context.tech_stack,
-            "file_structure": context.file_structure,
-            "decisions": context.decisions,
-            "patterns": context.patterns,
-            "conversation_summary": context.conversation_summary,
-            "last_updated": context.last_updated.isoformat()
-        }
+    def _save_contexts(self, contexts: List[ProjectContext]) -> None:
+        """Upsert contexts in one transaction (decisions live in their own table)."""
+        rows = [
+            (
+                context.project_id,
+                orjson.dumps({
+                    "tech_stack": context.tech_stack,
+                    "file_structure": context.file_structure,
+                    "patterns": context.patterns,
+                    "conversation_summary": context.conversation_summary,
+                }),
+                context.last_updated
+            )
+            for context in contexts
+        ]
         
-        with open(file_path, 'w') as f:
-            json.dump(data, f, indent=2)
+        with self._db_lock:
+            self._db.execute("BEGIN")
+            try:
+                self._db.executemany(
+                    "INSERT INTO contexts (id, blob, updated) VALUES (?, ?, ?) "
+                    "ON CONFLICT (id) DO UPDATE SET blob = excluded.blob, updated = excluded.updated",
+                    rows
+                )
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
     
     def _load_context(self, project_id: str) -> Optional[ProjectContext]:
-        """Load context from disk."""
-        file_path = self.context_path / f"{project_id}.json"
-        
-        if not file_path.exists():
-            return None
-        
+        """Load context from the database."""
         try:
-            with open(file_path, 'r') as f:
-                data = json.load(f)
+            with self._db_lock:
+                row = self._db.execute(
+                    "SELECT blob, updated FROM contexts WHERE id = ?", (project_id,)
+                ).fetchone()
+                decisions = [
+                    orjson.loads(blob)
+                    for (blob,) in self._db.execute(
+                        "SELECT blob FROM decisions WHERE project_id = ? ORDER BY rowid",
+                        (project_id,)
+                    )
+                ]
             
-            context = ProjectContext(project_id)
-            context.tech_stack = data.get("tech_stack", {})
-            context.file_structure = data.get("file_structure", [])
-            context.decisions = data.get("decisions", [])
-            context.patterns = data.get("patterns", [])
-            context.conversation_summary = data.get("conversation_summary", "")
+            if row is None and not decisions:
+                return self._import_legacy_context(project_id)
             
-            if data.get("last_updated"):
-                context.last_updated = datetime.fromisoformat(data["last_updated"])
+            context = ProjectContext(project_id)
+            if row is not None:
+                data = orjson.loads(row[0])
+                context.tech_stack = data.get("tech_stack", {})
+                context.file_structure = data.get("file_structure", [])
+                context.patterns = data.get("patterns", [])
+                context._patterns_set = set(context.patterns)
+                context.conversation_summary = data.get("conversation_summary", "")
+                context.last_updated = row[1]
+            context.decisions = decisions
             
             return context
         except Exception as e:
             print(f"Error loading context for {project_id}: {e}")
             return None
     
+    def _legacy_paths(self, project_id: str) -> Tuple[Path, Path]:
+        """Paths of the old per-project context file and decisions log."""
+        return (
+            self.context_path / f"{project_id}.json",
+            self.context_path / f"{project_id}.decisions.jsonl"
+        )
+    
+    def _remove_legacy_files(self, project_id: str) -> None:
+        """Delete a project's old context files, if any are left."""
+        for path in self._legacy_paths(project_id):
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+    
+    def _import_legacy_context(self, project_id: str) -> Optional[ProjectContext]:
+        """Move a context from the old per-project JSON files into the database."""
+        file_path, log_path = self._legacy_paths(project_id)
+        
+        if not file_path.exists() and not log_path.exists():
+            return None
+        
+        data = orjson.loads(file_path.read_bytes()) if file_path.exists() else {}
+        
+        context = ProjectContext(project_id)
+        context.tech_stack = data.get("tech_stack", {})
+        context.file_structure = data.get("file_structure", [])
+        context.patterns = data.get("patterns", [])
+        context._patterns_set = set(context.patterns)
+        context.conversation_summary = data.get("conversation_summary", "")
+        
+        if data.get("last_updated"):
+            loaded_at = datetime.fromisoformat(data["last_updated"])
+            context.last_updated = int(loaded_at.timestamp() * 1e9)
+        
+        # Older files stored decisions inline, newer ones in a sidecar log
+        context.decisions = data.get("decisions", [])
+        if log_path.exists():
+            with open(log_path, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        context.decisions.append(orjson.loads(line))
+        
+        with self._db_lock:
+            self._db.executemany(
+                "INSERT INTO decisions (project_id, blob) VALUES (?, ?)",
+                [(project_id, orjson.dumps(d)) for d in context.decisions]
+            )
+        self._save_contexts([context])
+        self._remove_legacy_files(project_id)
+        
+        return context
+    
     def clear_context(self, project_id: str) -> None:
         """Clear all context for a project."""
+        with self._dirty_lock:
+            self._dirty.discard(project_id)
+        
         if project_id in self.contexts:
             del self.contexts[project_id]
         
-        file_path = self.context_path / f"{project_id}.json"
-        if file_path.exists():
-            file_path.unlink()
+        with self._db_lock:
+            self._db.execute("DELETE FROM contexts WHERE id = ?", (project_id,))
+            self._db.execute("DELETE FROM decisions WHERE project_id = ?", (project_id,))
+        
+        # A project never opened since the move to SQLite may still have
+        # its old files, which would otherwise be re-imported on next access
+        self._remove_legacy_files(project_id)
 
 
 # Singleton instance
@@ -9,137 +9,19 @@ Features:
 5. Suggest missing dependencies
 """
 
-import re
-import json
-from typing import Dict, List, Optional, Set, Tuple
+import orjson
+from typing import Dict, List, Optional, Set, Tuple, Union
 from pathlib import Path
 from datetime import datetime
 from config import settings
+from services._dep_scan import (
+    JS_PACKAGE_MAPPINGS,
+    PYTHON_PACKAGE_MAPPINGS,
+    scan_js_imports,
+    scan_python_imports,
+)
 
 
-# Common package mappings (import name -> package name)
-PYTHON_PACKAGE_MAPPINGS = {
-    # Standard library (no install needed)
-    'os': None, 'sys': None, 'json': None, 'datetime': None, 're': None,
-    'pathlib': None, 'typing': None, 'collections': None, 'functools': None,
-    'itertools': None, 'math': None, 'random': None, 'time': None,
-    'asyncio': None, 'threading': None, 'subprocess': None, 'io': None,
-    'hashlib': None, 'base64': None, 'urllib': None, 'http': None,
-    
-    # Third-party packages
-    'fastapi': 'fastapi',
-    'uvicorn': 'uvicorn',
-    'pydantic': 'pydantic',
-    'requests': 'requests',
-    'httpx': 'httpx',
-    'aiohttp': 'aiohttp',
-    'flask': 'flask',
-    'django': 'django',
-    'numpy': 'numpy',
-    'pandas': 'pandas',
-    'scipy': 'scipy',
-    'matplotlib': 'matplotlib',
-    'seaborn': 'seaborn',
-    'sklearn': 'scikit-learn',
-    'tensorflow': 'tensorflow',
-    'torch': 'torch',
-    'transformers': 'transformers',
-    'openai': 'openai',
-    'anthropic': 'anthropic',
-    'chromadb': 'chromadb',
-    'sqlalchemy': 'sqlalchemy',
-    'alembic': 'alembic',
-    'pytest': 'pytest',
-    'redis': 'redis',
-    'celery': 'celery',
-    'boto3': 'boto3',
-    'pillow': 'Pillow',
-    'PIL': 'Pillow',
-    'cv2': 'opencv-python',
-    'bs4': 'beautifulsoup4',
-    'lxml': 'lxml',
-    'yaml': 'pyyaml',
-    'dotenv': 'python-dotenv',
-    'jwt': 'PyJWT',
-    'bcrypt': 'bcrypt',
-    'passlib': 'passlib',
-    'slowapi': 'slowapi',
-    'websockets': 'websockets',
-    'socketio': 'python-socketio',
-    'jinja2': 'Jinja2',
-    'markdown': 'markdown',
-    'rich': 'rich',
-    'click': 'click',
-    'typer': 'typer',
-    'streamlit': 'streamlit',
-    'gradio': 'gradio',
-}
-
-# JavaScript/TypeScript import to package mapping
-JS_PACKAGE_MAPPINGS = {
-    'react': 'react',
-    'react-dom': 'react-dom',
-    'next': 'next',
-    'vue': 'vue',
-    'svelte': 'svelte',
-    'express': 'express',
-    'axios': 'axios',
-    'lodash': 'lodash',
-    'moment': 'moment',
-    'dayjs': 'dayjs',
-    'date-fns': 'date-fns',
-    'uuid': 'uuid',
-    'zod': 'zod',
-    'yup': 'yup',
-    'formik': 'formik',
-    'react-hook-form': 'react-hook-form',
-    'tailwindcss': 'tailwindcss',
-    'styled-components': 'styled-components',
-    '@emotion/react': '@emotion/react',
-    '@emotion/styled': '@emotion/styled',
-    'framer-motion': 'framer-motion',
-    'gsap': 'gsap',
-    'three': 'three',
-    'd3': 'd3',
-    'chart.js': 'chart.js',
-    'recharts': 'recharts',
-    'socket.io': 'socket.io',
-    'socket.io-client': 'socket.io-client',
-    'mongoose': 'mongoose',
-    'prisma': '@prisma/client',
-    'typeorm': 'typeorm',
-    'sequelize': 'sequelize',
-    'bcryptjs': 'bcryptjs',
-    'jsonwebtoken': 'jsonwebtoken',
-    'cors': 'cors',
-    'helmet': 'helmet',
-    'morgan': 'morgan',
-    'winston': 'winston',
-    'dotenv': 'dotenv',
-    'commander': 'commander',
-    'inquirer': 'inquirer',
-    'chalk': 'chalk',
-    'ora': 'ora',
-    'jest': 'jest',
-    'mocha': 'mocha',
-    'chai': 'chai',
-    'cypress': 'cypress',
-    'playwright': '@playwright/test',
-    'lucide-react': 'lucide-react',
-    '@radix-ui': '@radix-ui/react-icons',
-    'clsx': 'clsx',
-    'class-variance-authority': 'class-variance-authority',
-    'tailwind-merge': 'tailwind-merge',
-    'zustand': 'zustand',
-    'redux': 'redux',
-    'react-redux': 'react-redux',
-    '@reduxjs/toolkit': '@reduxjs/toolkit',
-    'react-query': '@tanstack/react-query',
-    'swr': 'swr',
-    'react-router': 'react-router-dom',
-    'react-router-dom': 'react-router-dom',
-}
-
 # Default versions for common packages
 PYTHON_VERSIONS = {
     'fastapi': '>=0.104.0',
@@ -164,6 +46,56 @@ JS_VERSIONS = {
 }
 
 
+def _nested_json(value) -> str:
+    """Render a value as indented JSON for nesting one level into an object."""
+    return orjson.dumps(value, option=orjson.OPT_INDENT_2).decode().replace('\n', '\n  ')
+
+
+# package.json skeletons: the fixed fields are rendered once here and only
+# the name and dependency objects are serialized per call
+_NODE_SCRIPTS_JSON = _nested_json({
+    "start": "node index.js",
+    "dev": "node --watch index.js",
+    "build": "echo 'No build step required'",
+    "test": "echo 'No tests specified' && exit 0"
+})
+_NODE_PACKAGE_TRAILER = (
+    '"keywords": ' + _nested_json(["intelekt", "ai-generated"]),
+    '"author": ""',
+    '"license": "MIT"',
+)
+
+_REACT_PACKAGE_TEMPLATE = (
+    '{{\n'
+    '  "name": {name},\n'
+    '  "private": true,\n'
+    '  "version": "0.0.0",\n'
+    '  "type": "module",\n'
+    '  "scripts": {scripts},\n'
+    '  "dependencies": {dependencies},\n'
+    '  "devDependencies": {dev_dependencies}\n'
+    '}}'
+)
+_REACT_STATIC_FIELDS = {
+    "scripts": _nested_json({
+        "dev": "vite",
+        "build": "tsc && vite build",
+        "lint": "eslint . --ext ts,tsx",
+        "preview": "vite preview"
+    }),
+    "dev_dependencies": _nested_json({
+        "@types/react": "^18.2.0",
+        "@types/react-dom": "^18.2.0",
+        "@vitejs/plugin-react": "^4.2.0",
+        "typescript": "^5.3.0",
+        "vite": "^5.0.0"
+    }),
+}
+
+# Source file extensions scanned for imports
+_PY_EXTS = ('.py', '.pyw')
+_JS_EXTS = ('.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs')
+
 class DependencyService:
     """Service for managing project dependencies."""
     
@@ -171,93 +103,44 @@ class DependencyService:
         """Initialize dependency service."""
         self.projects_path = Path(settings.projects_path)
     
-    def detect_python_imports(self, code: str) -> Set[str]:
+    def detect_python_imports(self, code: Union[str, bytes]) -> Set[str]:
         """
         Detect Python imports from code.
         
         Returns a set of package names (not import names).
         """
-        imports = set()
-        
-        # Match 'import x' and 'from x import y'
-        import_patterns = [
-            r'^import\s+(\w+)',
-            r'^from\s+(\w+)',
-        ]
-        
-        for line in code.split('\n'):
-            line = line.strip()
-            for pattern in import_patterns:
-                match = re.match(pattern, line)
-                if match:
-                    module = match.group(1)
-                    # Get the package name (may differ from import name)
-                    if module in PYTHON_PACKAGE_MAPPINGS:
-                        package = PYTHON_PACKAGE_MAPPINGS[module]
-                        if package:  # None means standard library
-                            imports.add(package)
-                    else:
-                        # Unknown package, add as-is
-                        imports.add(module)
-        
-        return imports
+        return set(scan_python_imports(code))
     
-    def detect_js_imports(self, code: str) -> Set[str]:
+    def detect_js_imports(self, code: Union[str, bytes]) -> Set[str]:
         """
         Detect JavaScript/TypeScript imports from code.
         
         Returns a set of package names.
         """
-        imports = set()
-        
-        # Match various import patterns
-        import_patterns = [
-            r'import\s+.*?\s+from\s+[\'"]([^\.\/][^\'"]+)[\'"]',
-            r'import\s+[\'"]([^\.\/][^\'"]+)[\'"]',
-            r'require\s*\(\s*[\'"]([^\.\/][^\'"]+)[\'"]\s*\)',
-        ]
-        
-        for pattern in import_patterns:
-            matches = re.findall(pattern, code)
-            for match in matches:
-                # Handle scoped packages (@org/package)
-                if match.startswith('@'):
-                    parts = match.split('/')
-                    if len(parts) >= 2:
-                        package = f"{parts[0]}/{parts[1]}"
-                    else:
-                        package = match
-                else:
-                    # Get the base package name (before any subpath)
-                    package = match.split('/')[0]
-                
-                # Map to actual package if known
-                if package in JS_PACKAGE_MAPPINGS:
-                    imports.add(JS_PACKAGE_MAPPINGS[package])
-                else:
-                    imports.add(package)
-        
-        return imports
+        return set(scan_js_imports(code))
     
     def detect_dependencies_from_files(
         self, 
-        files: Dict[str, str]
+        files: Dict[str, Union[str, bytes]]
     ) -> Dict[str, Set[str]]:
         """
         Detect all dependencies from project files.
         
+        File contents may be str or raw bytes (scanned without decoding).
         Returns a dict with 'python' and 'javascript' dependency sets.
         """
         python_deps = set()
         js_deps = set()
         
+        # Scanned file by file so unchanged files hit the scan cache and
+        # editing one file only rescans that file
         for path, content in files.items():
-            ext = Path(path).suffix.lower()
+            lower_path = path.lower()
             
-            if ext in ['.py', '.pyw']:
-                python_deps.update(self.detect_python_imports(content))
-            elif ext in ['.js', '.jsx', '.ts', '.tsx', '.mjs', '.cjs']:
-                js_deps.update(self.detect_js_imports(content))
+            if lower_path.endswith(_PY_EXTS):
+                python_deps |= scan_python_imports(content)
+            elif lower_path.endswith(_JS_EXTS):
+                js_deps |= scan_js_imports(content)
         
         return {
             'python': python_deps,
@@ -278,11 +161,10 @@ class DependencyService:
             ""
         ]
         
-        for dep in sorted(dependencies):
-            if include_versions and dep in PYTHON_VERSIONS:
-                lines.append(f"{dep}{PYTHON_VERSIONS[dep]}")
-            else:
-                lines.append(dep)
+        if include_versions:
+            lines.extend(f"{dep}{PYTHON_VERSIONS.get(dep, '')}" for dep in sorted(dependencies))
+        else:
+            lines.extend(sorted(dependencies))
         
         return '\n'.join(lines)
     
@@ -298,49 +180,33 @@ class DependencyService:
         Generate package.json content for JavaScript/Node.js project.
         """
         # Build dependencies with versions
-        deps = {}
-        for dep in sorted(dependencies):
-            if dep in JS_VERSIONS:
-                deps[dep] = JS_VERSIONS[dep]
-            else:
-                deps[dep] = "latest"
+        deps = {dep: JS_VERSIONS.get(dep, "latest") for dep in sorted(dependencies)}
         
         # Build dev dependencies
         dev_deps = {}
         if dev_dependencies:
-            for dep in sorted(dev_dependencies):
-                if dep in JS_VERSIONS:
-                    dev_deps[dep] = JS_VERSIONS[dep]
-                else:
-                    dev_deps[dep] = "latest"
-        
-        package = {
-            "name": project_name.lower().replace(' ', '-'),
-            "version": "1.0.0",
-            "description": f"Generated by Intelekt AI",
-            "type": project_type,
-            "main": "index.js",
-        }
+            dev_deps = {dep: JS_VERSIONS.get(dep, "latest") for dep in sorted(dev_dependencies)}
+        
+        fields = [
+            '"name": ' + orjson.dumps(project_name.lower().replace(' ', '-')).decode(),
+            '"version": "1.0.0"',
+            '"description": "Generated by Intelekt AI"',
+            '"type": ' + orjson.dumps(project_type).decode(),
+            '"main": "index.js"',
+        ]
         
         if include_scripts:
-            package["scripts"] = {
-                "start": "node index.js",
-                "dev": "node --watch index.js",
-                "build": "echo 'No build step required'",
-                "test": "echo 'No tests specified' && exit 0"
-            }
+            fields.append('"scripts": ' + _NODE_SCRIPTS_JSON)
         
         if deps:
-            package["dependencies"] = deps
+            fields.append('"dependencies": ' + _nested_json(deps))
         
         if dev_deps:
-            package["devDependencies"] = dev_deps
+            fields.append('"devDependencies": ' + _nested_json(dev_deps))
         
-        package["keywords"] = ["intelekt", "ai-generated"]
-        package["author"] = ""
-        package["license"] = "MIT"
+        fields.extend(_NODE_PACKAGE_TRAILER)
         
-        return json.dumps(package, indent=2)
+        return "{\n  " + ",\n  ".join(fields) + "\n}"
     
     def generate_react_package_json(
         self,
@@ -357,37 +223,17 @@ class DependencyService:
         }
         
         # Add detected dependencies
-        for dep in sorted(dependencies):
-            if dep not in core_deps:
-                if dep in JS_VERSIONS:
-                    core_deps[dep] = JS_VERSIONS[dep]
-                else:
-                    core_deps[dep] = "latest"
-        
-        dev_deps = {
-            "@types/react": "^18.2.0",
-            "@types/react-dom": "^18.2.0",
-            "@vitejs/plugin-react": "^4.2.0",
-            "typescript": "^5.3.0",
-            "vite": "^5.0.0"
-        }
-        
-        package = {
-            "name": project_name.lower().replace(' ', '-'),
-            "private": True,
-            "version": "0.0.0",
-            "type": "module",
-            "scripts": {
-                "dev": "vite",
-                "build": "tsc && vite build",
-                "lint": "eslint . --ext ts,tsx",
-                "preview": "vite preview"
-            },
-            "dependencies": core_deps,
-            "devDependencies": dev_deps
-        }
-        
-        return json.dumps(package, indent=2)
+        core_deps.update(
+            (dep, JS_VERSIONS.get(dep, "latest"))
+            for dep in sorted(dependencies)
+            if dep not in core_deps
+        )
+        
+        return _REACT_PACKAGE_TEMPLATE.format_map({
+            **_REACT_STATIC_FIELDS,
+            "name": orjson.dumps(project_name.lower().replace(' ', '-')).decode(),
+            "dependencies": _nested_json(core_deps),
+        })
     
     def suggest_dependencies(
         self,
@@ -8,16 +8,126 @@ This service handles:
 4. Managing deployment status
 """
 
+import hashlib
 import httpx
 import json
+import orjson
 import os
-import zipfile
-import tempfile
-import base64
-from typing import Dict, List, Optional
-from pathlib import Path
+import re
+import sys
+from cachetools import LRUCache, TTLCache
+from dataclasses import dataclass
+from itertools import product
+from typing import Dict, List, Optional, Tuple
 from config import settings
 
+# Seconds a deployment status is reused for repeated polls
+STATUS_POLL_TTL = 2.0
+
+
+def _build_railway_config(
+    has_python: bool,
+    has_mojo: bool,
+    has_package_json: bool,
+    has_html: bool
+) -> str:
+    """Build railway.json configuration."""
+    config = {
+        "$schema": "https://railway.app/railway.schema.json",
+        "build": {},
+        "deploy": {}
+    }
+    
+    if has_python:
+        config["build"]["builder"] = "NIXPACKS"
+        config["deploy"]["startCommand"] = "python main.py"
+        config["deploy"]["healthcheckPath"] = "/health"
+    elif has_package_json:
+        config["build"]["builder"] = "NIXPACKS"
+        config["deploy"]["startCommand"] = "npm start"
+    elif has_html:
+        # Static site
+        config["build"]["builder"] = "STATIC"
+        config["deploy"]["startCommand"] = "npx serve ."
+    
+    return json.dumps(config, indent=2)
+
+
+# railway.json depends only on the project-type flags, so every variant is
+# serialized once at import: (has_python, has_mojo, has_package_json, has_html) -> JSON
+_RAILWAY_JSON_CACHE: Dict[Tuple[bool, bool, bool, bool], str] = {
+    flags: _build_railway_config(*flags)
+    for flags in product((False, True), repeat=4)
+}
+
+# nixpacks.toml bodies; interned so every prepared deploy shares one copy
+_NIXPACKS_PYTHON = sys.intern('''[phases.setup]
+nixPkgs = ["python311", "gcc"]
+
+[phases.install]
+cmds = ["pip install -r requirements.txt"]
+
+[start]
+cmd = "python main.py"
+''')
+
+_NIXPACKS_NODE = sys.intern('''[phases.setup]
+nixPkgs = ["nodejs-18_x"]
+
+[phases.install]
+cmds = ["npm install"]
+
+[start]
+cmd = "npm start"
+''')
+
+_NIXPACKS_STATIC = sys.intern('''[phases.setup]
+nixPkgs = ["nodejs-18_x"]
+
+[start]
+cmd = "npx serve ."
+''')
+
+# Preferred Python entry points, best first; any other .py file ranks last
+_MAIN_PY_PRIORITY = {
+    name: rank
+    for rank, name in enumerate(['main.py', 'app.py', 'server.py', 'api.py', 'run.py'])
+}
+
+# Packages detected for the generated requirements.txt (import name -> package)
+_REQUIREMENT_PACKAGES = {
+    'fastapi': 'fastapi',
+    'flask': 'flask',
+    'django': 'django',
+    'chromadb': 'chromadb',
+    'uvicorn': 'uvicorn',
+    'httpx': 'httpx',
+    'requests': 'requests',
+    'pandas': 'pandas',
+    'numpy': 'numpy',
+    'pydantic': 'pydantic',
+}
+# One pass per file finds 'import x' / 'from x' lines for any known package
+_REQUIREMENT_IMPORT_RE = re.compile(
+    r'^\s*(?:import|from)\s+(' + '|'.join(_REQUIREMENT_PACKAGES) + r')\b',
+    re.MULTILINE
+)
+
+
+@dataclass
+class FileClassification:
+    """What kind of app a set of project files makes up."""
+    has_python: bool
+    has_mojo: bool
+    has_package_json: bool
+    has_html: bool
+    main_py: str
+    
+    @property
+    def is_deployable(self) -> bool:
+        """Whether Railway has anything to build or serve."""
+        return self.has_python or self.has_mojo or self.has_package_json or self.has_html
+
 
 class DeploymentService:
     """Service for deploying generated apps to Railway."""
@@ -27,6 +137,43 @@ class DeploymentService:
     def __init__(self):
         """Initialize deployment service."""
         self.api_token = os.getenv("RAILWAY_API_TOKEN")
+        # Shared pooled client, created on first use so it binds to the
+        # running event loop; closed by aclose() at shutdown
+        self._client: Optional[httpx.AsyncClient] = None
+        # (deployment_id, token) -> last status, so rapid polls from the
+        # frontend don't each hit the Railway API
+        self._status_cache: TTLCache = TTLCache(maxsize=1024, ttl=STATUS_POLL_TTL)
+        # Digest of the input files -> generated deployment files, so a
+        # redeploy of the same app skips detection and config generation
+        self._prepared_cache: LRUCache = LRUCache(maxsize=64)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared Railway API client, reusing pooled connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                headers={"Content-Type": "application/json"},
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_keepalive_connections=10, max_connections=20),
+                # Concurrent calls (e.g. status polls) share one connection
+                http2=True
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared Railway API client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    async def _post_graphql(self, query: str, variables: Dict, token: str) -> Dict:
+        """Run a GraphQL operation against the Railway API."""
+        # Serialize with orjson; the client already sends the JSON content type
+        response = await self._get_client().post(
+            self.RAILWAY_API_URL,
+            content=orjson.dumps({"query": query, "variables": variables}),
+            headers={"Authorization": f"Bearer {token}"}
+        )
+        return orjson.loads(response.content)
     
     def is_configured(self) -> bool:
         """Check if Railway API is configured."""
@@ -54,10 +201,21 @@ class DeploymentService:
         if not token:
             raise ValueError("Railway API token not configured")
         
+        # Reject empty or unrecognized projects before any network I/O
+        if not files:
+            raise ValueError("No files to deploy")
+        if not self._classify(files).is_deployable:
+            raise ValueError(
+                "Nothing to deploy: expected Python, Mojo, package.json or HTML files"
+            )
+        
         # Generate deployment files
         deployment_files = self._prepare_deployment_files(files)
         
-        # Create project on Railway
+        # Create project on Railway. The project, service and deployment
+        # mutations can't share one batched request: each takes the ID
+        # returned by the previous one (projectId -> serviceId), so they
+        # run in sequence over the pooled connection instead.
         project = await self._create_railway_project(project_name, token)
         
         # Deploy files
@@ -79,37 +237,75 @@ class DeploymentService:
     
     def _prepare_deployment_files(self, files: Dict[str, str]) -> Dict[str, str]:
         """Prepare files for Railway deployment."""
-        deployment_files = dict(files)
+        # Key the cache on the paths and contents of every input file
+        digest = hashlib.blake2b(digest_size=16)
+        for path in sorted(files):
+            digest.update(path.encode())
+            digest.update(b"\0")
+            digest.update(files[path].encode())
+            digest.update(b"\0")
+        key = digest.digest()
+        
+        generated = self._prepared_cache.get(key)
+        if generated is None:
+            generated = tuple(self._generate_deployment_files(files).items())
+            self._prepared_cache[key] = generated
         
-        # Detect project type
-        has_python = any(f.endswith('.py') for f in files.keys())
-        has_mojo = any(f.endswith('.mojo') for f in files.keys())
-        has_package_json = 'package.json' in files
-        has_html = any(f.endswith('.html') for f in files.keys())
+        deployment_files = dict(files)
+        deployment_files.update(generated)
+        return deployment_files
+    
+    def _generate_deployment_files(self, files: Dict[str, str]) -> Dict[str, str]:
+        """Generate the deployment config files missing from a project."""
+        generated = {}
+        kind = self._classify(files)
         
         # Add Railway config if not present
-        if 'railway.json' not in deployment_files:
-            deployment_files['railway.json'] = self._generate_railway_config(
-                has_python, has_mojo, has_package_json, has_html
+        if 'railway.json' not in files:
+            generated['railway.json'] = self._generate_railway_config(
+                kind.has_python, kind.has_mojo, kind.has_package_json, kind.has_html
             )
         
         # Add Procfile for Python apps
-        if has_python and 'Procfile' not in deployment_files:
-            # Find the main Python file
-            main_file = self._find_main_python_file(files)
-            deployment_files['Procfile'] = f"web: python {main_file}"
+        if kind.has_python and 'Procfile' not in files:
+            generated['Procfile'] = f"web: python {kind.main_py}"
         
         # Add requirements.txt if Python and not present
-        if has_python and 'requirements.txt' not in deployment_files:
-            deployment_files['requirements.txt'] = self._generate_requirements(files)
+        if kind.has_python and 'requirements.txt' not in files:
+            generated['requirements.txt'] = self._generate_requirements(files)
         
         # Add nixpacks.toml for better build detection
-        if 'nixpacks.toml' not in deployment_files:
-            deployment_files['nixpacks.toml'] = self._generate_nixpacks_config(
-                has_python, has_mojo, has_package_json
+        if 'nixpacks.toml' not in files:
+            generated['nixpacks.toml'] = self._generate_nixpacks_config(
+                kind.has_python, kind.has_mojo, kind.has_package_json
             )
         
-        return deployment_files
+        return generated
+    
+    def _classify(self, files: Dict[str, str]) -> FileClassification:
+        """Detect the project type and main Python file in a single pass."""
+        has_python = has_mojo = has_html = False
+        main_py = 'main.py'
+        best_rank = len(_MAIN_PY_PRIORITY) + 1
+        for path in files:
+            if path.endswith('.py'):
+                has_python = True
+                rank = _MAIN_PY_PRIORITY.get(path, len(_MAIN_PY_PRIORITY))
+                if rank < best_rank:
+                    best_rank = rank
+                    main_py = path
+            elif path.endswith('.mojo'):
+                has_mojo = True
+            elif path.endswith('.html'):
+                has_html = True
+        
+        return FileClassification(
+            has_python=has_python,
+            has_mojo=has_mojo,
+            has_package_json='package.json' in files,
+            has_html=has_html,
+            main_py=main_py
+        )
     
     def _generate_railway_config(
         self,
@@ -119,64 +315,16 @@ class DeploymentService:
         has_html: bool
     ) -> str:
         """Generate railway.json configuration."""
-        config = {
-            "$schema": "https://railway.app/railway.schema.json",
-            "build": {},
-            "deploy": {}
-        }
-        
-        if has_python:
-            config["build"]["builder"] = "NIXPACKS"
-            config["deploy"]["startCommand"] = "python main.py"
-            config["deploy"]["healthcheckPath"] = "/health"
-        elif has_package_json:
-            config["build"]["builder"] = "NIXPACKS"
-            config["deploy"]["startCommand"] = "npm start"
-        elif has_html:
-            # Static site
-            config["build"]["builder"] = "STATIC"
-            config["deploy"]["startCommand"] = "npx serve ."
-        
-        return json.dumps(config, indent=2)
-    
-    def _find_main_python_file(self, files: Dict[str, str]) -> str:
-        """Find the main Python entry point."""
-        priority_names = ['main.py', 'app.py', 'server.py', 'api.py', 'run.py']
-        
-        for name in priority_names:
-            if name in files:
-                return name
-        
-        # Return first Python file found
-        for f in files.keys():
-            if f.endswith('.py'):
-                return f
-        
-        return 'main.py'
+        return _RAILWAY_JSON_CACHE[(has_python, has_mojo, has_package_json, has_html)]
     
     def _generate_requirements(self, files: Dict[str, str]) -> str:
         """Generate requirements.txt based on imports in Python files."""
-        requirements = set()
-        
-        # Common packages to detect
-        package_map = {
-            'fastapi': 'fastapi',
-            'flask': 'flask',
-            'django': 'django',
-            'chromadb': 'chromadb',
-            'uvicorn': 'uvicorn',
-            'httpx': 'httpx',
-            'requests': 'requests',
-            'pandas': 'pandas',
-            'numpy': 'numpy',
-            'pydantic': 'pydantic',
+        requirements = {
+            _REQUIREMENT_PACKAGES[import_name]
+            for content in files.values()
+            for import_name in _REQUIREMENT_IMPORT_RE.findall(content)
         }
         
-        for content in files.values():
-            for import_name, package_name in package_map.items():
-                if f'import {import_name}' in content or f'from {import_name}' in content:
-                    requirements.add(package_name)
-        
         # Always include these for AI apps
         requirements.add('chromadb')
         
@@ -194,32 +342,8 @@ class DeploymentService:
     ) -> str:
         """Generate nixpacks.toml for Railway."""
         if has_python:
-            return '''[phases.setup]
-nixPkgs = ["python311", "gcc"]
-
-[phases.install]
-cmds = ["pip install -r requirements.txt"]
-
-[start]
-cmd = "python main.py"
-'''
-        elif has_package_json:
-            return '''[phases.setup]
-nixPkgs = ["nodejs-18_x"]
-
-[phases.install]
-cmds = ["npm install"]
-
-[start]
-cmd = "npm start"
-'''
-        else:
-            return '''[phases.setup]
-nixPkgs = ["nodejs-18_x"]
-
-[start]
-cmd = "npx serve ."
-'''
+            return _NIXPACKS_PYTHON
+        return _NIXPACKS_NODE if has_package_json else _NIXPACKS_STATIC
     
     async def _create_railway_project(
         self,
@@ -243,23 +367,12 @@ cmd = "npx serve ."
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.RAILWAY_API_URL,
-                json={"query": query, "variables": variables},
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
-            
-            data = response.json()
-            
-            if "errors" in data:
-                raise Exception(f"Railway API error: {data['errors']}")
-            
-            return data["data"]["projectCreate"]
+        data = await self._post_graphql(query, variables, token)
+        
+        if "errors" in data:
+            raise Exception(f"Railway API error: {data['errors']}")
+        
+        return data["data"]["projectCreate"]
     
     async def _deploy_to_railway(
         self,
@@ -284,11 +397,6 @@ cmd = "npx serve ."
         }
         """
         
-        # Encode files as base64 for the API
-        encoded_files = {}
-        for path, content in files.items():
-            encoded_files[path] = base64.b64encode(content.encode()).decode()
-        
         variables = {
             "input": {
                 "serviceId": service["id"],
@@ -298,35 +406,24 @@ cmd = "npx serve ."
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.RAILWAY_API_URL,
-                json={"query": query, "variables": variables},
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
-            
-            data = response.json()
-            
-            if "errors" in data:
-                # Return partial success - project created
-                return {
-                    "id": None,
-                    "status": "pending",
-                    "url": f"https://{service.get('name', 'app')}.up.railway.app",
-                    "message": "Project created. Connect GitHub for auto-deploy."
-                }
-            
-            deployment = data.get("data", {}).get("deploymentCreate", {})
-            
+        data = await self._post_graphql(query, variables, token)
+        
+        if "errors" in data:
+            # Return partial success - project created
             return {
-                "id": deployment.get("id"),
-                "status": deployment.get("status", "deploying"),
-                "url": f"https://{service.get('name', 'app')}.up.railway.app"
+                "id": None,
+                "status": "pending",
+                "url": f"https://{service.get('name', 'app')}.up.railway.app",
+                "message": "Project created. Connect GitHub for auto-deploy."
             }
+        
+        deployment = data.get("data", {}).get("deploymentCreate", {})
+        
+        return {
+            "id": deployment.get("id"),
+            "status": deployment.get("status", "deploying"),
+            "url": f"https://{service.get('name', 'app')}.up.railway.app"
+        }
     
     async def _create_service(self, project_id: str, token: str) -> Dict:
         """Create a service in the Railway project."""
@@ -346,23 +443,12 @@ cmd = "npx serve ."
             }
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.RAILWAY_API_URL,
-                json={"query": query, "variables": variables},
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
-            
-            data = response.json()
-            
-            if "errors" in data:
-                raise Exception(f"Railway API error: {data['errors']}")
-            
-            return data["data"]["serviceCreate"]
+        data = await self._post_graphql(query, variables, token)
+        
+        if "errors" in data:
+            raise Exception(f"Railway API error: {data['errors']}")
+        
+        return data["data"]["serviceCreate"]
     
     async def get_deployment_status(
         self,
@@ -372,6 +458,11 @@ cmd = "npx serve ."
         """Get the status of a deployment."""
         token = token or self.api_token
         
+        cache_key = (deployment_id, token)
+        cached = self._status_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         query = """
         query deployment($id: String!) {
             deployment(id: $id) {
@@ -382,23 +473,14 @@ cmd = "npx serve ."
         }
         """
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                self.RAILWAY_API_URL,
-                json={"query": query, "variables": {"id": deployment_id}},
-                headers={
-                    "Authorization": f"Bearer {token}",
-                    "Content-Type": "application/json"
-                },
-                timeout=30.0
-            )
-            
-            data = response.json()
-            
-            if "errors" in data:
-                return {"status": "unknown", "error": data["errors"]}
-            
-            return data.get("data", {}).get("deployment", {})
+        data = await self._post_graphql(query, {"id": deployment_id}, token)
+        
+        if "errors" in data:
+            return {"status": "unknown", "error": data["errors"]}
+        
+        status = data.get("data", {}).get("deployment", {})
+        self._status_cache[cache_key] = status
+        return status
     
     def generate_deploy_instructions(self, files: Dict[str, str]) -> str:
         """Generate manual deployment instructions."""
@@ -1,15 +1,54 @@
-from fastapi_mail import FastMail, MessageSchema, ConnectionConfig, MessageType
+from __future__ import annotations
+
 from pydantic import EmailStr
 from config import settings
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional, Set
+import asyncio
 import httpx
+from functools import lru_cache
+from string import Template
+
+# fastapi_mail is only needed once an SMTP send happens; import it lazily
+if TYPE_CHECKING:
+    from fastapi_mail import ConnectionConfig
+
+# Seconds Resend gets to deliver before SMTP is tried alongside it
+RESEND_HEDGE_DELAY = 2.0
+
+# Pooled client for the Resend API, created on first send
+_RESEND_CLIENT: Optional[httpx.AsyncClient] = None
+
+# Cap on sends in flight across both transports, so signup bursts don't
+# trip provider rate limits
+EMAIL_CONCURRENCY = 20
+_EMAIL_SEMAPHORE = asyncio.Semaphore(EMAIL_CONCURRENCY)
+
+# Queued sends, drained by worker tasks started with the app; bounded so a
+# burst applies backpressure instead of growing without limit
+EMAIL_QUEUE_SIZE = 1000
+EMAIL_DRAIN_TIMEOUT = 10.0
+_EMAIL_QUEUE: Optional[asyncio.Queue] = None
+_EMAIL_WORKERS: List[asyncio.Task] = []
+_UNQUEUED_SENDS: Set[asyncio.Task] = set()  # strong refs until done
+
+# Retries (with doubling delay, in seconds) when Resend answers 429
+RESEND_MAX_RETRIES = 3
+RESEND_BACKOFF_BASE = 0.5
 
 # Email configuration
+@lru_cache(maxsize=1)
 def get_mail_config() -> Optional[ConnectionConfig]:
-    """Get email configuration if SMTP is configured."""
+    """
+    Get email configuration if SMTP is configured.
+    
+    Built once and reused; call get_mail_config.cache_clear() after
+    changing mail settings at runtime.
+    """
     if not settings.mail_username or not settings.mail_password:
         return None
     
+    from fastapi_mail import ConnectionConfig
+    
     return ConnectionConfig(
         MAIL_USERNAME=settings.mail_username,
         MAIL_PASSWORD=settings.mail_password,
@@ -32,6 +71,32 @@ def _get_resend_from() -> Optional[str]:
     return settings.resend_from
 
 
+def _get_resend_client() -> httpx.AsyncClient:
+    """Get the shared Resend client so sends reuse one keep-alive connection."""
+    global _RESEND_CLIENT
+    if _RESEND_CLIENT is None or _RESEND_CLIENT.is_closed:
+        _RESEND_CLIENT = httpx.AsyncClient(
+            base_url="https://api.resend.com",
+            timeout=httpx.Timeout(5.0),
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=20),
+            # Concurrent sends multiplex over one connection
+            http2=True,
+            headers={
+                "Authorization": f"Bearer {settings.resend_api_key}",
+                "Content-Type": "application/json",
+            },
+        )
+    return _RESEND_CLIENT
+
+
+async def close_resend_client() -> None:
+    """Close the shared Resend client (called at shutdown)."""
+    global _RESEND_CLIENT
+    if _RESEND_CLIENT is not None:
+        await _RESEND_CLIENT.aclose()
+        _RESEND_CLIENT = None
+
+
 async def _send_via_resend(to_email: EmailStr, subject: str, html: str) -> bool:
     if not settings.resend_api_key:
         return False
@@ -41,13 +106,9 @@ async def _send_via_resend(to_email: EmailStr, subject: str, html: str) -> bool:
         return False
 
     try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            response = await client.post(
-                "https://api.resend.com/emails",
-                headers={
-                    "Authorization": f"Bearer {settings.resend_api_key}",
-                    "Content-Type": "application/json",
-                },
+        for attempt in range(RESEND_MAX_RETRIES + 1):
+            response = await _get_resend_client().post(
+                "/emails",
                 json={
                     "from": from_value,
                     "to": [str(to_email)],
@@ -55,7 +116,10 @@ async def _send_via_resend(to_email: EmailStr, subject: str, html: str) -> bool:
                     "html": html,
                 },
             )
-            response.raise_for_status()
+            if response.status_code != 429 or attempt == RESEND_MAX_RETRIES:
+                break
+            await asyncio.sleep(RESEND_BACKOFF_BASE * 2 ** attempt)
+        response.raise_for_status()
         return True
     except Exception as e:
         print(f"[EMAIL] Failed to send via Resend: {e}")
@@ -67,6 +131,8 @@ async def _send_via_smtp(to_email: EmailStr, subject: str, html: str) -> bool:
     if not config:
         return False
 
+    from fastapi_mail import FastMail, MessageSchema, MessageType
+
     message = MessageSchema(
         subject=subject,
         recipients=[to_email],
@@ -83,25 +149,22 @@ async def _send_via_smtp(to_email: EmailStr, subject: str, html: str) -> bool:
         return False
 
 
-async def send_verification_email(email: EmailStr, token: str) -> bool:
-    """Send email verification link."""
-    verification_url = f"{settings.frontend_url}/verify-email?token={token}"
-    
-    html = f"""
+# Email bodies, parsed once; only the link is filled in per send
+_VERIFY_TEMPLATE = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #f4f4f7; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .card {{ background: white; border-radius: 12px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }}
-            .logo {{ text-align: center; margin-bottom: 30px; }}
-            .logo h1 {{ color: #4F46E5; margin: 0; font-size: 32px; }}
-            h2 {{ color: #1a1a2e; margin-bottom: 20px; }}
-            p {{ color: #4a4a68; line-height: 1.6; }}
-            .button {{ display: inline-block; background: linear-gradient(135deg, #4F46E5 0%, #7C3AED 100%); color: white; padding: 14px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; margin: 20px 0; }}
-            .button:hover {{ opacity: 0.9; }}
-            .footer {{ text-align: center; margin-top: 30px; color: #9ca3af; font-size: 12px; }}
+            body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #f4f4f7; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .card { background: white; border-radius: 12px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
+            .logo { text-align: center; margin-bottom: 30px; }
+            .logo h1 { color: #4F46E5; margin: 0; font-size: 32px; }
+            h2 { color: #1a1a2e; margin-bottom: 20px; }
+            p { color: #4a4a68; line-height: 1.6; }
+            .button { display: inline-block; background: linear-gradient(135deg, #4F46E5 0%, #7C3AED 100%); color: white; padding: 14px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; margin: 20px 0; }
+            .button:hover { opacity: 0.9; }
+            .footer { text-align: center; margin-top: 30px; color: #9ca3af; font-size: 12px; }
         </style>
     </head>
     <body>
@@ -113,7 +176,7 @@ async def send_verification_email(email: EmailStr, token: str) -> bool:
                 <h2>Verify Your Email</h2>
                 <p>Welcome to Intelekt! Please verify your email address to complete your registration.</p>
                 <p>Click the button below to verify your email:</p>
-                <a href="{verification_url}" class="button">Verify Email</a>
+                <a href="$verification_url" class="button">Verify Email</a>
                 <p style="font-size: 14px; color: #9ca3af;">If you didn't create an account with Intelekt, you can safely ignore this email.</p>
                 <p style="font-size: 12px; color: #9ca3af;">This link will expire in 24 hours.</p>
             </div>
@@ -123,40 +186,24 @@ async def send_verification_email(email: EmailStr, token: str) -> bool:
         </div>
     </body>
     </html>
-    """
-    
-    subject = "Verify Your Email - Intelekt"
-
-    if await _send_via_resend(email, subject, html):
-        return True
-
-    if await _send_via_smtp(email, subject, html):
-        return True
+    """)
 
-    print(f"[EMAIL] Email not sent (Resend/SMTP not configured). Verification token for {email}: {token}")
-    return False
-
-
-async def send_password_reset_email(email: EmailStr, token: str) -> bool:
-    """Send password reset link."""
-    reset_url = f"{settings.frontend_url}/reset-password?token={token}"
-    
-    html = f"""
+_RESET_TEMPLATE = Template("""
     <!DOCTYPE html>
     <html>
     <head>
         <style>
-            body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #f4f4f7; }}
-            .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-            .card {{ background: white; border-radius: 12px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }}
-            .logo {{ text-align: center; margin-bottom: 30px; }}
-            .logo h1 {{ color: #4F46E5; margin: 0; font-size: 32px; }}
-            h2 {{ color: #1a1a2e; margin-bottom: 20px; }}
-            p {{ color: #4a4a68; line-height: 1.6; }}
-            .button {{ display: inline-block; background: linear-gradient(135deg, #4F46E5 0%, #7C3AED 100%); color: white; padding: 14px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; margin: 20px 0; }}
-            .button:hover {{ opacity: 0.9; }}
-            .footer {{ text-align: center; margin-top: 30px; color: #9ca3af; font-size: 12px; }}
-            .warning {{ background: #fef3c7; border-left: 4px solid #f59e0b; padding: 12px; margin: 20px 0; border-radius: 4px; }}
+            body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; padding: 0; background-color: #f4f4f7; }
+            .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+            .card { background: white; border-radius: 12px; padding: 40px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1); }
+            .logo { text-align: center; margin-bottom: 30px; }
+            .logo h1 { color: #4F46E5; margin: 0; font-size: 32px; }
+            h2 { color: #1a1a2e; margin-bottom: 20px; }
+            p { color: #4a4a68; line-height: 1.6; }
+            .button { display: inline-block; background: linear-gradient(135deg, #4F46E5 0%, #7C3AED 100%); color: white; padding: 14px 32px; text-decoration: none; border-radius: 8px; font-weight: 600; margin: 20px 0; }
+            .button:hover { opacity: 0.9; }
+            .footer { text-align: center; margin-top: 30px; color: #9ca3af; font-size: 12px; }
+            .warning { background: #fef3c7; border-left: 4px solid #f59e0b; padding: 12px; margin: 20px 0; border-radius: 4px; }
         </style>
     </head>
     <body>
@@ -167,7 +214,7 @@ async def send_password_reset_email(email: EmailStr, token: str) -> bool:
                 </div>
                 <h2>Reset Your Password</h2>
                 <p>We received a request to reset your password. Click the button below to create a new password:</p>
-                <a href="{reset_url}" class="button">Reset Password</a>
+                <a href="$reset_url" class="button">Reset Password</a>
                 <div class="warning">
                     <p style="margin: 0; color: #92400e; font-size: 14px;">⚠️ This link will expire in 1 hour for security reasons.</p>
                 </div>
@@ -179,14 +226,120 @@ async def send_password_reset_email(email: EmailStr, token: str) -> bool:
         </div>
     </body>
     </html>
+    """)
+
+
+async def _send_limited(send, to_email: EmailStr, subject: str, html: str) -> bool:
+    """Run one transport send under the shared concurrency cap."""
+    async with _EMAIL_SEMAPHORE:
+        return await send(to_email, subject, html)
+
+
+async def _deliver(to_email: EmailStr, subject: str, html: str) -> bool:
+    """Send via Resend, hedging with SMTP if Resend is slow; first success wins."""
+    senders = []
+    if settings.resend_api_key and _get_resend_from():
+        senders.append(_send_via_resend)
+    if get_mail_config():
+        senders.append(_send_via_smtp)
+
+    pending = set()
+    try:
+        for i, send in enumerate(senders):
+            pending.add(asyncio.create_task(_send_limited(send, to_email, subject, html)))
+            # Earlier transports get a head start; a failure moves on at once
+            timeout = RESEND_HEDGE_DELAY if i < len(senders) - 1 else None
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if any(task.result() for task in done):
+                    return True
+                if not done:
+                    break
+        return False
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def _email_worker() -> None:
+    """Send queued emails until cancelled."""
+    while True:
+        send, args = await _EMAIL_QUEUE.get()
+        try:
+            await send(*args)
+        except Exception as e:
+            print(f"[EMAIL] Queued send failed: {e}")
+        finally:
+            _EMAIL_QUEUE.task_done()
+
+
+def start_email_workers() -> None:
+    """Start the background email workers (called at startup)."""
+    global _EMAIL_QUEUE
+    if _EMAIL_WORKERS:
+        return
+    _EMAIL_QUEUE = asyncio.Queue(maxsize=EMAIL_QUEUE_SIZE)
+    for _ in range(EMAIL_CONCURRENCY):
+        _EMAIL_WORKERS.append(asyncio.create_task(_email_worker()))
+
+
+async def stop_email_workers() -> None:
+    """Give queued emails a moment to go out, then stop the workers."""
+    global _EMAIL_QUEUE
+    if not _EMAIL_WORKERS:
+        return
+    try:
+        await asyncio.wait_for(_EMAIL_QUEUE.join(), EMAIL_DRAIN_TIMEOUT)
+    except asyncio.TimeoutError:
+        print(f"[EMAIL] Dropping {_EMAIL_QUEUE.qsize()} unsent emails at shutdown")
+    for worker in _EMAIL_WORKERS:
+        worker.cancel()
+    await asyncio.gather(*_EMAIL_WORKERS, return_exceptions=True)
+    _EMAIL_WORKERS.clear()
+    _EMAIL_QUEUE = None
+
+
+async def enqueue_email(send, *args) -> None:
     """
+    Schedule an email send off the request path.
     
-    subject = "Reset Your Password - Intelekt"
+    Waits only if the queue is full. Without running workers (scripts,
+    tests) the send is started as a task instead.
+    """
+    if _EMAIL_QUEUE is None:
+        task = asyncio.create_task(send(*args))
+        _UNQUEUED_SENDS.add(task)
+        task.add_done_callback(_UNQUEUED_SENDS.discard)
+        return
+    await _EMAIL_QUEUE.put((send, args))
+
 
-    if await _send_via_resend(email, subject, html):
+async def send_verification_email(email: EmailStr, token: str) -> bool:
+    """Send email verification link."""
+    verification_url = f"{settings.frontend_url}/verify-email?token={token}"
+    
+    html = _VERIFY_TEMPLATE.substitute(verification_url=verification_url)
+    
+    subject = "Verify Your Email - Intelekt"
+
+    if await _deliver(email, subject, html):
         return True
 
-    if await _send_via_smtp(email, subject, html):
+    print(f"[EMAIL] Email not sent (Resend/SMTP not configured). Verification token for {email}: {token}")
+    return False
+
+
+async def send_password_reset_email(email: EmailStr, token: str) -> bool:
+    """Send password reset link."""
+    reset_url = f"{settings.frontend_url}/reset-password?token={token}"
+    
+    html = _RESET_TEMPLATE.substitute(reset_url=reset_url)
+    
+    subject = "Reset Your Password - Intelekt"
+
+    if await _deliver(email, subject, html):
         return True
 
     print(f"[EMAIL] Email not sent (Resend/SMTP not configured). Reset token for {email}: {token}")
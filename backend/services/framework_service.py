@@ -6,11 +6,21 @@ their startup idea before any code is generated. It ensures ideas are
 properly analyzed, validated, and refined.
 """
 
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 from datetime import datetime
-import json
+from hashlib import blake2b
+from pathlib import Path
+from types import MappingProxyType
+import os
+import orjson
+from cachetools import LRUCache
+from config import settings
+
+
+# Sessions kept in memory; least recently used ones are spilled to disk
+MAX_FRAMEWORK_SESSIONS = int(os.getenv("FRAMEWORK_CACHE_MAX", "1000"))
 
 
 class FrameworkPhase(str, Enum):
@@ -32,19 +42,66 @@ class StepStatus(str, Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+# Statuses that count a step as done
+_DONE = frozenset((StepStatus.COMPLETED, StepStatus.SKIPPED))
+
+
+@dataclass(slots=True)
 class FrameworkStep:
-    """Represents a single step in the framework."""
+    """
+    Per-session state of a single step in the framework.
+    
+    Only the mutable fields are stored; the static ones (name, phase,
+    description, key questions, deliverables) are read from the shared
+    step template.
+    """
     number: int
-    name: str
-    phase: FrameworkPhase
-    description: str
-    key_questions: List[str]
-    deliverables: List[str]
     status: StepStatus = StepStatus.NOT_STARTED
     user_responses: Dict[str, Any] = field(default_factory=dict)
     ai_analysis: Optional[str] = None
-    completed_at: Optional[datetime] = None
+    completed_at: Optional[str] = None  # ISO timestamp
+    insight: Optional[str] = None  # Key insight from ai_analysis, see set_analysis
+    
+    @property
+    def name(self) -> str:
+        return _STEP_TEMPLATE[self.number]["name"]
+    
+    @property
+    def phase(self) -> FrameworkPhase:
+        return _STEP_PHASE[self.number - 1]
+    
+    @property
+    def description(self) -> str:
+        return _STEP_TEMPLATE[self.number]["description"]
+    
+    @property
+    def key_questions(self) -> Tuple[str, ...]:
+        return _STEP_TEMPLATE[self.number]["key_questions"]
+    
+    @property
+    def deliverables(self) -> Tuple[str, ...]:
+        return _STEP_TEMPLATE[self.number]["deliverables"]
+    
+    def set_analysis(self, analysis: Optional[str]) -> None:
+        """Set the AI analysis and cache its first sentence as the key insight."""
+        self.ai_analysis = analysis
+        self.insight = None
+        if analysis:
+            # Only scan as far as an insight may be long (under 200 chars)
+            dot = analysis.find('.', 0, 200)
+            if dot >= 0:
+                self.insight = analysis[:dot]
+            elif len(analysis) < 200:
+                self.insight = analysis
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a flat dict of template and state fields for the API."""
+        view = dict(_STEP_TEMPLATE[self.number])
+        view["status"] = self.status
+        view["user_responses"] = self.user_responses
+        view["ai_analysis"] = self.ai_analysis
+        view["completed_at"] = self.completed_at
+        return view
 
 
 # Define all 24 steps of the MIT Disciplined Entrepreneurship framework
@@ -396,11 +453,123 @@ MIT_24_STEPS: List[Dict] = [
 ]
 
 
+# The step definitions never change; store their lists as tuples
+for _step in MIT_24_STEPS:
+    _step["key_questions"] = tuple(_step["key_questions"])
+    _step["deliverables"] = tuple(_step["deliverables"])
+del _step
+
+# Frozen per-step schema shared by every session; FrameworkStep records
+# only hold the mutable state and resolve static fields here
+_STEP_TEMPLATE: Dict[int, MappingProxyType] = {
+    step["number"]: MappingProxyType(step) for step in MIT_24_STEPS
+}
+
+# Phase of each step, indexed by step number - 1
+_STEP_PHASE: Tuple[FrameworkPhase, ...] = tuple(step["phase"] for step in MIT_24_STEPS)
+
+# Step numbers in each phase, in framework order
+_PHASE_STEPS: Mapping[FrameworkPhase, Tuple[int, ...]] = MappingProxyType({
+    phase: tuple(number for number, step_phase in enumerate(_STEP_PHASE, 1) if step_phase is phase)
+    for phase in dict.fromkeys(_STEP_PHASE)
+})
+_PHASE_TOTALS: Dict[FrameworkPhase, int] = {phase: len(steps) for phase, steps in _PHASE_STEPS.items()}
+
+# Bit n is set for each step n required before development can start
+_REQUIRED_MASK = sum(1 << n for n in (1, 2, 5, 7, 8, 21))
+
+
+def _json_default(obj: Any) -> Any:
+    """orjson fallback that flattens FrameworkStep records."""
+    if isinstance(obj, FrameworkStep):
+        return obj.to_dict()
+    raise TypeError
+
+
+def serialize_session(session: Mapping[str, Any]) -> bytes:
+    """
+    Serialize a session to JSON for the API.
+    
+    orjson encodes enums and tuples natively and stringifies the int step
+    keys; steps are flattened with their template fields on the way out.
+    Underscore-prefixed bookkeeping fields are left out.
+    """
+    return orjson.dumps(
+        {key: value for key, value in session.items() if not key.startswith("_")},
+        default=_json_default,
+        option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+    )
+
+
+def _dump_spilled_session(session: Mapping[str, Any]) -> bytes:
+    """Serialize a whole session, bookkeeping included, for the spill file."""
+    return orjson.dumps(session, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _load_spilled_session(data: bytes) -> Dict:
+    """Rebuild a session written by _dump_spilled_session."""
+    session = orjson.loads(data)
+    session["current_phase"] = FrameworkPhase(session["current_phase"])
+    session["steps"] = {
+        int(key): FrameworkStep(**{**step, "status": StepStatus(step["status"])})
+        for key, step in session["steps"].items()
+    }
+    counters = session["_counters"]
+    counters["phase"] = {FrameworkPhase(phase): count for phase, count in counters["phase"].items()}
+    return session
+
+
+class _SessionCache(LRUCache):
+    """
+    LRU session cache that spills evicted sessions to disk and reloads them on access.
+    
+    Spill files are plain JSON, never pickle: they live under projects_path,
+    where generated files are written too, so loading them must not be able
+    to run code.
+    """
+    
+    def __init__(self, maxsize: int, spill_path: Path):
+        super().__init__(maxsize=maxsize)
+        self.spill_path = spill_path
+        self.spill_path.mkdir(parents=True, exist_ok=True)
+    
+    def _spill_file(self, project_id: str) -> Path:
+        # Project IDs come from request paths; hash them into safe file names
+        return self.spill_path / f"{blake2b(project_id.encode(), digest_size=16).hexdigest()}.json"
+    
+    def __setitem__(self, project_id: str, session: Dict) -> None:
+        if project_id not in self:
+            # A new or reloaded session supersedes any spilled copy
+            try:
+                os.unlink(self._spill_file(project_id))
+            except FileNotFoundError:
+                pass
+        super().__setitem__(project_id, session)
+    
+    def __missing__(self, project_id: str) -> Dict:
+        try:
+            data = self._spill_file(project_id).read_bytes()
+        except FileNotFoundError:
+            raise KeyError(project_id) from None
+        session = _load_spilled_session(data)
+        self[project_id] = session
+        return session
+    
+    def popitem(self):
+        project_id, session = super().popitem()
+        self._spill_file(project_id).write_bytes(_dump_spilled_session(session))
+        return project_id, session
+
+
 class FrameworkService:
     """Service for managing the MIT 24-Step framework analysis."""
     
     def __init__(self):
-        self.sessions: Dict[str, Dict] = {}  # project_id -> framework state
+        # project_id -> framework state
+        self.sessions: _SessionCache = _SessionCache(
+            MAX_FRAMEWORK_SESSIONS,
+            Path(settings.projects_path) / ".framework_sessions"
+        )
         # Lightweight sample content to prefill the framework for demo purposes
         self.sample_responses: Dict[int, Dict[str, Any]] = {
             1: {"ai_analysis": "Targeting indie developers needing faster MVP launches.", "user_responses": {"segments": "Indie devs, small agencies, early founders"}},
@@ -428,72 +597,117 @@ class FrameworkService:
             23: {"ai_analysis": "MVBP: paid Pro tier with export/deploy reliability.", "user_responses": {}},
             24: {"ai_analysis": "Product plan: improve preview, add team collab, enterprise pilots.", "user_responses": {}},
         }
+        # The prefilled sample session is identical for every request apart
+        # from a few fields, so it is built once and cloned per request
+        self._sample_template: Dict = self._build_sample_session()
     
-    def initialize_framework(self, project_id: str, idea_description: str) -> Dict:
-        """Initialize a new framework session for a project."""
-        session = {
+    def _new_session(self, project_id: str, idea_description: str, now_iso: Optional[str]) -> Dict:
+        """Build a fresh session with every step not started."""
+        return {
             "project_id": project_id,
             "idea_description": idea_description,
             "current_step": 1,
             "current_phase": FrameworkPhase.CUSTOMER,
-            "steps": {str(step["number"]): {
-                **step,
-                "status": StepStatus.NOT_STARTED,
-                "user_responses": {},
-                "ai_analysis": None,
-                "completed_at": None
-            } for step in MIT_24_STEPS},
+            "steps": {key: FrameworkStep(key) for key in _STEP_TEMPLATE},
             "framework_summary": None,
             "ready_for_development": False,
-            "created_at": datetime.now().isoformat(),
-            "updated_at": datetime.now().isoformat()
+            "created_at": now_iso,
+            "updated_at": now_iso,
+            # Completed/skipped step counts and a bitmask of done steps (bit n
+            # for step n), kept in sync by _set_step_status
+            "_counters": {"completed": 0, "phase": {phase: 0 for phase in _PHASE_TOTALS}},
+            "_done_mask": 0
         }
+    
+    def initialize_framework(self, project_id: str, idea_description: str) -> Dict:
+        """Initialize a new framework session for a project."""
+        session = self._new_session(project_id, idea_description, datetime.now().isoformat())
         self.sessions[project_id] = session
         return session
     
-    def initialize_sample_framework(self, project_id: str, idea_description: str = "Sample: Intelekt - AI MVP Copilot") -> Dict:
-        """Initialize a sample session with prefilled analyses for demo/preview."""
-        session = self.initialize_framework(project_id, idea_description)
-        for step_num, payload in self.sample_responses.items():
-            key = str(step_num)
+    def _build_sample_session(self) -> Dict:
+        """Build the sample session with placeholder identity and timestamps."""
+        session = self._new_session("", "", None)
+        for key, payload in self.sample_responses.items():
             if key in session["steps"]:
-                session["steps"][key]["ai_analysis"] = payload.get("ai_analysis")
-                session["steps"][key]["user_responses"] = payload.get("user_responses", {})
-                session["steps"][key]["status"] = StepStatus.COMPLETED
-                session["steps"][key]["completed_at"] = datetime.now().isoformat()
+                session["steps"][key].set_analysis(payload.get("ai_analysis"))
+                session["steps"][key].user_responses = payload.get("user_responses", {})
+                self._set_step_status(session, key, StepStatus.COMPLETED)
         session["current_step"] = 24
         session["current_phase"] = FrameworkPhase.SCALING
         session["ready_for_development"] = True
-        session["updated_at"] = datetime.now().isoformat()
+        return session
+    
+    def initialize_sample_framework(self, project_id: str, idea_description: str = "Sample: Intelekt - AI MVP Copilot") -> Dict:
+        """Initialize a sample session with prefilled analyses for demo/preview."""
+        now_iso = datetime.now().isoformat()
+        template = self._sample_template
+        counters = template["_counters"]
+        session = {
+            **template,
+            "project_id": project_id,
+            "idea_description": idea_description,
+            "steps": {
+                key: FrameworkStep(
+                    key, step.status, dict(step.user_responses), step.ai_analysis, now_iso, step.insight
+                )
+                for key, step in template["steps"].items()
+            },
+            "created_at": now_iso,
+            "updated_at": now_iso,
+            "_counters": {"completed": counters["completed"], "phase": dict(counters["phase"])}
+        }
         self.sessions[project_id] = session
         return session
     
     def fast_track_framework(self, project_id: str, idea_description: str) -> Dict:
         """Fast-track by marking key steps as skipped to allow development quickly."""
         session = self.initialize_framework(project_id, idea_description)
-        required_steps = [1, 2, 5, 7, 8, 21]
-        for step_num in required_steps:
-            key = str(step_num)
-            session["steps"][key]["status"] = StepStatus.SKIPPED
-            session["steps"][key]["ai_analysis"] = session["steps"][key]["ai_analysis"] or "Fast-tracked placeholder - please refine."
-            session["steps"][key]["completed_at"] = datetime.now().isoformat()
+        now_iso = session["created_at"]
+        required_steps = (1, 2, 5, 7, 8, 21)
+        for key in required_steps:
+            self._set_step_status(session, key, StepStatus.SKIPPED)
+            session["steps"][key].set_analysis(session["steps"][key].ai_analysis or "Fast-tracked placeholder - please refine.")
+            session["steps"][key].completed_at = now_iso
         session["current_step"] = max(required_steps)
-        session["current_phase"] = session["steps"][str(session["current_step"])]["phase"]
+        session["current_phase"] = _STEP_PHASE[session["current_step"] - 1]
         session["ready_for_development"] = True
-        session["updated_at"] = datetime.now().isoformat()
+        session["updated_at"] = now_iso
         self.sessions[project_id] = session
         return session
     
-    def get_session(self, project_id: str) -> Optional[Dict]:
-        """Get the framework session for a project."""
-        return self.sessions.get(project_id)
+    def get_session(self, project_id: str) -> Optional[Mapping[str, Any]]:
+        """
+        Get the framework session for a project.
+        
+        Returns a read-only view of the live session, so callers can share
+        it without copying; changes go through the service's methods.
+        """
+        session = self._get_session(project_id)
+        return MappingProxyType(session) if session is not None else None
+    
+    def _get_session(self, project_id: str) -> Optional[Dict]:
+        """Get the mutable framework session for a project."""
+        try:
+            return self.sessions[project_id]
+        except KeyError:
+            return None
     
     def get_current_step(self, project_id: str) -> Optional[Dict]:
         """Get the current step for a project."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
+        if not session:
+            return None
+        step = session["steps"].get(session["current_step"])
+        return step.to_dict() if step else None
+    
+    def get_step(self, project_id: str, step_number: int) -> Optional[Dict]:
+        """Get a specific step for a project."""
+        session = self._get_session(project_id)
         if not session:
             return None
-        return session["steps"].get(str(session["current_step"]))
+        step = session["steps"].get(step_number)
+        return step.to_dict() if step else None
     
     def update_step(
         self, 
@@ -503,25 +717,26 @@ class FrameworkService:
         ai_analysis: str
     ) -> Dict:
         """Update a step with user responses and AI analysis."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             raise ValueError(f"No framework session for project {project_id}")
         
-        step_key = str(step_number)
-        if step_key not in session["steps"]:
+        if not 1 <= step_number <= 24:
             raise ValueError(f"Invalid step number: {step_number}")
+        step = session["steps"][step_number]
         
-        session["steps"][step_key]["user_responses"] = user_responses
-        session["steps"][step_key]["ai_analysis"] = ai_analysis
-        session["steps"][step_key]["status"] = StepStatus.COMPLETED
-        session["steps"][step_key]["completed_at"] = datetime.now().isoformat()
-        session["updated_at"] = datetime.now().isoformat()
+        step.user_responses = user_responses
+        step.set_analysis(ai_analysis)
+        self._set_step_status(session, step_number, StepStatus.COMPLETED)
+        now_iso = datetime.now().isoformat()
+        step.completed_at = now_iso
+        session["updated_at"] = now_iso
         
-        return session["steps"][step_key]
+        return step.to_dict()
     
     def advance_to_next_step(self, project_id: str) -> Optional[Dict]:
         """Move to the next step in the framework."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             return None
         
@@ -531,38 +746,49 @@ class FrameworkService:
             return None
         
         session["current_step"] = current + 1
-        next_step = session["steps"][str(current + 1)]
+        next_step = session["steps"][current + 1]
         
         # Update phase if needed
-        session["current_phase"] = next_step["phase"]
-        session["steps"][str(current + 1)]["status"] = StepStatus.IN_PROGRESS
+        session["current_phase"] = _STEP_PHASE[current]
+        self._set_step_status(session, current + 1, StepStatus.IN_PROGRESS)
         session["updated_at"] = datetime.now().isoformat()
         
-        return next_step
+        return next_step.to_dict()
     
     def skip_step(self, project_id: str, step_number: int) -> Dict:
         """Skip a step (for advanced users)."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             raise ValueError(f"No framework session for project {project_id}")
         
-        step_key = str(step_number)
-        session["steps"][step_key]["status"] = StepStatus.SKIPPED
+        if not 1 <= step_number <= 24:
+            raise ValueError(f"Invalid step number: {step_number}")
+        
+        self._set_step_status(session, step_number, StepStatus.SKIPPED)
         session["updated_at"] = datetime.now().isoformat()
         
         return self.advance_to_next_step(project_id)
     
+    def _set_step_status(self, session: Dict, step_number: int, status: StepStatus) -> None:
+        """Set a step's status and update the session's completion counters."""
+        step = session["steps"][step_number]
+        delta = (status in _DONE) - (step.status in _DONE)
+        step.status = status
+        
+        if delta:
+            counters = session["_counters"]
+            counters["completed"] += delta
+            counters["phase"][step.phase] += delta
+            session["_done_mask"] ^= 1 << step_number
+    
     def get_framework_progress(self, project_id: str) -> Dict:
         """Get overall framework progress."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             return {"error": "No session found"}
         
         total_steps = 24
-        completed = sum(
-            1 for s in session["steps"].values() 
-            if s["status"] in [StepStatus.COMPLETED, StepStatus.SKIPPED]
-        )
+        completed = session["_counters"]["completed"]
         
         return {
             "current_step": session["current_step"],
@@ -576,37 +802,26 @@ class FrameworkService:
     
     def _get_phases_completed(self, session: Dict) -> Dict[str, bool]:
         """Check which phases are completed."""
-        phase_steps = {
-            FrameworkPhase.CUSTOMER: [1, 2, 3, 4, 5],
-            FrameworkPhase.VALUE: [6, 7, 8, 9],
-            FrameworkPhase.ACQUISITION: [10, 11, 12, 13, 14],
-            FrameworkPhase.MONETIZATION: [15, 16, 17],
-            FrameworkPhase.BUILDING: [18, 19, 20],
-            FrameworkPhase.SCALING: [21, 22, 23, 24]
-        }
-        
+        phase_counts = session["_counters"]["phase"]
         return {
-            phase.value: all(
-                session["steps"][str(step)]["status"] in [StepStatus.COMPLETED, StepStatus.SKIPPED]
-                for step in steps
-            )
-            for phase, steps in phase_steps.items()
+            phase.value: phase_counts[phase] == total
+            for phase, total in _PHASE_TOTALS.items()
         }
     
     def generate_framework_summary(self, project_id: str) -> Dict:
         """Generate a comprehensive summary of the framework analysis."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             return {"error": "No session found"}
         
         summary = {
             "idea": session["idea_description"],
-            "beachhead_market": session["steps"]["2"].get("ai_analysis", ""),
-            "persona": session["steps"]["5"].get("ai_analysis", ""),
-            "value_proposition": session["steps"]["8"].get("ai_analysis", ""),
-            "business_model": session["steps"]["15"].get("ai_analysis", ""),
-            "mvp_specification": session["steps"]["21"].get("ai_analysis", ""),
-            "product_plan": session["steps"]["24"].get("ai_analysis", ""),
+            "beachhead_market": session["steps"][2].ai_analysis,
+            "persona": session["steps"][5].ai_analysis,
+            "value_proposition": session["steps"][8].ai_analysis,
+            "business_model": session["steps"][15].ai_analysis,
+            "mvp_specification": session["steps"][21].ai_analysis,
+            "product_plan": session["steps"][24].ai_analysis,
             "key_insights": self._extract_key_insights(session),
             "ready_for_development": session["ready_for_development"]
         }
@@ -618,75 +833,76 @@ class FrameworkService:
         """Extract key insights from completed steps."""
         insights = []
         for step_num, step in session["steps"].items():
-            if step["status"] == StepStatus.COMPLETED and step.get("ai_analysis"):
-                # Extract first sentence or key point from analysis
-                analysis = step["ai_analysis"]
-                if analysis:
-                    first_sentence = analysis.split('.')[0]
-                    if len(first_sentence) < 200:
-                        insights.append(f"Step {step_num}: {first_sentence}")
-        return insights[:10]  # Top 10 insights
+            # Insights are extracted when the analysis is set
+            if step.status == StepStatus.COMPLETED and step.insight is not None:
+                insights.append(f"Step {step_num}: {step.insight}")
+                if len(insights) == 10:  # Top 10 insights
+                    break
+        return insights
     
     def can_start_development(self, project_id: str) -> Dict:
         """Check if the project is ready to start development."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             return {"can_start": False, "reason": "No framework session found"}
         
+        if session["_done_mask"] & _REQUIRED_MASK == _REQUIRED_MASK:
+            return {
+                "can_start": True,
+                "reason": "All required framework steps completed",
+                "recommendation": "Proceed with MVP development"
+            }
+        
         # Minimum requirements to start development
-        required_steps = [1, 2, 5, 7, 8, 21]  # Market, Beachhead, Persona, Product Spec, Value Prop, MVP
+        required_steps = (1, 2, 5, 7, 8, 21)  # Market, Beachhead, Persona, Product Spec, Value Prop, MVP
         
         missing_steps = []
         for step_num in required_steps:
-            step = session["steps"][str(step_num)]
-            if step["status"] not in [StepStatus.COMPLETED, StepStatus.SKIPPED]:
-                missing_steps.append(f"Step {step_num}: {step['name']}")
-        
-        if missing_steps:
-            return {
-                "can_start": False,
-                "reason": "Required steps not completed",
-                "missing_steps": missing_steps
-            }
+            step = session["steps"][step_num]
+            if step.status not in _DONE:
+                missing_steps.append(f"Step {step_num}: {step.name}")
         
         return {
-            "can_start": True,
-            "reason": "All required framework steps completed",
-            "recommendation": "Proceed with MVP development"
+            "can_start": False,
+            "reason": "Required steps not completed",
+            "missing_steps": missing_steps
         }
     
     def get_framework_prompt_for_step(self, project_id: str) -> str:
         """Generate the AI system prompt for the current framework step."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             return ""
         
-        current_step = self.get_current_step(project_id)
+        current_step = session["steps"].get(session["current_step"])
         if not current_step:
             return ""
         
         # Gather context from previous steps
-        previous_context = []
-        for i in range(1, current_step["number"]):
-            step = session["steps"][str(i)]
-            if step["status"] == StepStatus.COMPLETED and step.get("ai_analysis"):
-                previous_context.append(f"**Step {i} - {step['name']}**: {step['ai_analysis'][:500]}...")
+        previous_context: List[str] = []
+        steps = session["steps"]
+        for i in range(1, current_step.number):
+            step = steps[i]
+            analysis = step.ai_analysis
+            if step.status != StepStatus.COMPLETED or not analysis:
+                continue
+            previous_context.append(f"**Step {i} - {step.name}**: {analysis[:500]}...")
         
         prompt = f"""You are Intelekt, an AI startup advisor using the MIT 24-Step Disciplined Entrepreneurship Framework.
 
 CURRENT STATE:
 - User's Idea: {session['idea_description']}
-- Current Step: {current_step['number']} of 24 - {current_step['name']}
-- Phase: {current_step['phase'].value.upper()}
+- Current Step: {current_step.number} of 24 - {current_step.name}
+- Phase: {current_step.phase.value.upper()}
 
 STEP DETAILS:
-{current_step['description']}
+{current_step.description}
 
 KEY QUESTIONS TO EXPLORE:
-{chr(10).join(f"- {q}" for q in current_step['key_questions'])}
+{chr(10).join(f"- {q}" for q in current_step.key_questions)}
 
 EXPECTED DELIVERABLES:
-{chr(10).join(f"- {d}" for d in current_step['deliverables'])}
+{chr(10).join(f"- {d}" for d in current_step.deliverables)}
 
 {"PREVIOUS ANALYSIS:" + chr(10) + chr(10).join(previous_context) if previous_context else ""}
 
@@ -711,7 +927,7 @@ Remember: Great products start with great understanding of customers and markets
     
     def export_framework_document(self, project_id: str) -> str:
         """Export the framework analysis as a formatted document."""
-        session = self.get_session(project_id)
+        session = self._get_session(project_id)
         if not session:
             return "No framework session found"
         
@@ -733,11 +949,11 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
         
         current_phase = None
         for step_num in range(1, 25):
-            step = session["steps"][str(step_num)]
+            step = session["steps"][step_num]
             
             # Add phase header
-            if step["phase"] != current_phase:
-                current_phase = step["phase"]
+            if step.phase != current_phase:
+                current_phase = step.phase
                 doc += f"\n## {phase_names[current_phase]}\n\n"
             
             status_emoji = {
@@ -747,19 +963,19 @@ Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}
                 StepStatus.NOT_STARTED: "⬜"
             }
             
-            doc += f"### Step {step_num}: {step['name']} {status_emoji.get(step['status'], '')}\n\n"
+            doc += f"### Step {step_num}: {step.name} {status_emoji.get(step.status, '')}\n\n"
             
-            if step["status"] == StepStatus.COMPLETED:
-                if step.get("user_responses"):
+            if step.status == StepStatus.COMPLETED:
+                if step.user_responses:
                     doc += "**User Inputs:**\n"
-                    for key, value in step["user_responses"].items():
+                    for key, value in step.user_responses.items():
                         doc += f"- {key}: {value}\n"
                     doc += "\n"
                 
-                if step.get("ai_analysis"):
-                    doc += f"**Analysis:**\n{step['ai_analysis']}\n\n"
+                if step.ai_analysis:
+                    doc += f"**Analysis:**\n{step.ai_analysis}\n\n"
             else:
-                doc += f"*{step['description']}*\n\n"
+                doc += f"*{step.description}*\n\n"
             
             doc += "---\n"
         
@@ -9,15 +9,29 @@ Features:
 5. Diff viewing
 """
 
+import re
 import subprocess
 import os
-from typing import Dict, List, Optional, Tuple
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, List, Literal, Optional, Sequence, Tuple, Union
 from datetime import datetime
 from pathlib import Path
 from dataclasses import dataclass
+from cachetools import LRUCache, TTLCache
 from config import settings
 
 
+# Worker threads for fanning git calls out across projects
+GIT_POOL_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Long-running `git cat-file --batch` processes kept open at once
+MAX_CAT_FILE_PROCS = 64
+
+# Seconds an is_git_repo answer is reused before checking the disk again
+REPO_CHECK_TTL = 5.0
+
+
 @dataclass
 class Commit:
     """Represents a git commit."""
@@ -47,56 +61,252 @@ class FileDiff:
     diff_content: str
 
 
+# How get_status treats untracked files: skip them, list directories, or
+# list every file
+UntrackedMode = Literal['no', 'normal', 'all']
+
+# Porcelain status code -> word
+_STATUS_WORDS = {
+    'A': 'added',
+    'M': 'modified',
+    'D': 'deleted',
+    'R': 'renamed',
+    '?': 'untracked'
+}
+# The same mapping indexed by the code's byte value, for parsing raw output
+_STATUS_TABLE = tuple(_STATUS_WORDS.get(chr(i), 'unknown') for i in range(256))
+
+# git log record: hash, short hash, subject, author, date separated by US
+# (0x1f) and terminated by RS (0x1e)
+_LOG_FORMAT = '%H%x1f%h%x1f%s%x1f%an%x1f%ad%x1e'
+
+# Prebuilt argv for the frequent fixed-shape commands
+_GIT_STATUS_ARGV = {
+    mode: ('git', '--no-optional-locks', 'status', '--porcelain', '-z', f'-u{mode}')
+    for mode in ('no', 'normal', 'all')
+}
+_GIT_ADD_ALL_ARGV = ('git', 'add', '-A')
+_GIT_INDEX_CLEAN_ARGV = ('git', 'diff', '--cached', '--quiet')
+_GIT_HEAD_HASH_ARGV = ('git', 'rev-parse', 'HEAD')
+_GIT_HEAD_BRANCH_ARGV = ('git', 'rev-parse', '--abbrev-ref', 'HEAD')
+_NUMSTAT_ARGS = ('--numstat', '-z')
+# staged -> (patch argv, numstat argv)
+_GIT_DIFF_ARGV = {
+    staged: (argv, argv + _NUMSTAT_ARGS)
+    for staged, argv in ((False, ('git', 'diff')), (True, ('git', 'diff', '--cached')))
+}
+
+# Start of each per-file section in `git diff` output
+_DIFF_HEADER_RE = re.compile(rb'^(?=diff --(?:git|cc|combined) )', re.MULTILINE)
+
+
+def _patch_status(patch: bytes) -> str:
+    """Derive a file's change status from its raw patch header."""
+    if b'\nnew file mode ' in patch:
+        return 'added'
+    if b'\ndeleted file mode ' in patch:
+        return 'deleted'
+    if b'\nrename from ' in patch:
+        return 'renamed'
+    return 'modified'
+
+
+class _CatFile:
+    """A `git cat-file --batch` process answering object reads for one repo."""
+    
+    def __init__(self, cwd: str):
+        self.proc = subprocess.Popen(
+            ['git', 'cat-file', '--batch'],
+            cwd=cwd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL
+        )
+        self.lock = threading.Lock()
+    
+    def read(self, spec: bytes) -> Optional[Tuple[bytes, bytes]]:
+        """
+        Look up an object by name, e.g. b'HEAD:path'.
+        
+        Returns (type, content), or None if git can't resolve the name.
+        Raises OSError if the process has gone away.
+        """
+        with self.lock:
+            self.proc.stdin.write(spec + b'\n')
+            self.proc.stdin.flush()
+            
+            header = self.proc.stdout.readline()
+            if not header:
+                raise BrokenPipeError("git cat-file exited")
+            if header.endswith((b' missing\n', b' ambiguous\n')):
+                return None
+            
+            _, obj_type, size = header.split()
+            size = int(size)
+            # Content is followed by a newline
+            content = self.proc.stdout.read(size + 1)
+            if len(content) != size + 1:
+                raise BrokenPipeError("git cat-file exited")
+            return obj_type, content[:size]
+    
+    def close(self) -> None:
+        """Stop the process once any in-flight read finishes."""
+        with self.lock:
+            try:
+                self.proc.stdin.close()
+                self.proc.wait(timeout=1)
+            except (OSError, subprocess.TimeoutExpired):
+                self.proc.kill()
+                self.proc.wait()
+            self.proc.stdout.close()
+
+
+class _CatFileCache(LRUCache):
+    """LRU of cat-file processes that stops a process when it is evicted."""
+    
+    def popitem(self):
+        project_id, cat_file = super().popitem()
+        cat_file.close()
+        return project_id, cat_file
+
+
 class GitService:
     """Service for git operations on projects."""
     
     def __init__(self):
         """Initialize git service."""
         self.projects_path = Path(settings.projects_path)
+        # project_id -> project directory (as a str, ready for cwd=), and
+        # project_id -> whether it is a repo, so chatty status/log polling
+        # doesn't rebuild paths or re-stat .git every call
+        self._project_paths: LRUCache = LRUCache(maxsize=1024)
+        self._is_repo_cache: TTLCache = TTLCache(maxsize=1024, ttl=REPO_CHECK_TTL)
+        # cachetools caches aren't thread-safe (even reads reorder them) and
+        # the multi-project calls hit them from the worker pool
+        self._cache_lock = threading.Lock()
+        # Created on first multi-project call; shut down by close()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # project_id -> open cat-file process, reused across file reads
+        self._cat_file_procs: _CatFileCache = _CatFileCache(maxsize=MAX_CAT_FILE_PROCS)
+        self._cat_file_lock = threading.Lock()
     
-    def _get_project_path(self, project_id: str) -> Path:
+    def _get_project_path(self, project_id: str) -> str:
         """Get the path to a project directory."""
-        return self.projects_path / project_id
+        with self._cache_lock:
+            path = self._project_paths.get(project_id)
+            if path is None:
+                path = self._project_paths[project_id] = str(self.projects_path / project_id)
+        return path
+    
+    def _get_pool(self) -> ThreadPoolExecutor:
+        """Get the shared executor for multi-project calls."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=GIT_POOL_WORKERS,
+                thread_name_prefix="git"
+            )
+        return self._pool
+    
+    def close(self) -> None:
+        """Shut down the multi-project worker pool and cat-file processes."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        
+        with self._cat_file_lock:
+            while self._cat_file_procs:
+                self._cat_file_procs.popitem()
+    
+    def _get_cat_file(self, project_id: str) -> _CatFile:
+        """Get the project's cat-file process, starting one if needed."""
+        with self._cat_file_lock:
+            cat_file = self._cat_file_procs.get(project_id)
+            if cat_file is None or cat_file.proc.poll() is not None:
+                cat_file = _CatFile(self._get_project_path(project_id))
+                self._cat_file_procs[project_id] = cat_file
+            return cat_file
+    
+    def _drop_cat_file(self, project_id: str, cat_file: _CatFile) -> None:
+        """Discard a cat-file process that stopped responding."""
+        with self._cat_file_lock:
+            if self._cat_file_procs.get(project_id) is cat_file:
+                del self._cat_file_procs[project_id]
+        cat_file.close()
+    
+    def invalidate(self, project_id: str) -> None:
+        """
+        Forget cached repo state for a project changed outside this service.
+        
+        Call when a project directory is created or deleted.
+        """
+        with self._cache_lock:
+            self._is_repo_cache.pop(project_id, None)
+            self._project_paths.pop(project_id, None)
+        
+        # A cat-file process outlives its directory and would keep serving
+        # objects from the old repository
+        with self._cat_file_lock:
+            cat_file = self._cat_file_procs.pop(project_id, None)
+        if cat_file is not None:
+            cat_file.close()
     
     def _run_git(
         self, 
         project_id: str, 
         args: List[str],
-        check: bool = True
-    ) -> Tuple[bool, str, str]:
+        check: bool = True,
+        text: bool = True
+    ) -> Tuple[bool, Union[str, bytes], str]:
         """
         Run a git command in the project directory.
         
-        Returns (success, stdout, stderr).
+        Returns (success, stdout, stderr). With text=False stdout is left
+        as raw bytes; stderr is always decoded.
         """
+        return self._run_argv(project_id, ['git'] + args, text)
+    
+    def _run_argv(
+        self,
+        project_id: str,
+        argv: Sequence[str],
+        text: bool = True
+    ) -> Tuple[bool, Union[str, bytes], str]:
+        """Run a complete git argv (e.g. a prebuilt _GIT_* tuple) like _run_git."""
         project_path = self._get_project_path(project_id)
+        empty = "" if text else b""
         
-        if not project_path.exists():
-            return False, "", "Project directory does not exist"
+        if not os.path.exists(project_path):
+            return False, empty, "Project directory does not exist"
         
         try:
             result = subprocess.run(
-                ['git'] + args,
+                argv,
                 cwd=project_path,
                 capture_output=True,
-                text=True,
+                text=text,
                 timeout=30
             )
             
             success = result.returncode == 0
-            return success, result.stdout, result.stderr
+            stderr = result.stderr if text else result.stderr.decode(errors='replace')
+            return success, result.stdout, stderr
             
         except subprocess.TimeoutExpired:
-            return False, "", "Git command timed out"
+            return False, empty, "Git command timed out"
         except FileNotFoundError:
-            return False, "", "Git is not installed"
+            return False, empty, "Git is not installed"
         except Exception as e:
-            return False, "", str(e)
+            return False, empty, str(e)
     
     def is_git_repo(self, project_id: str) -> bool:
         """Check if project is a git repository."""
-        project_path = self._get_project_path(project_id)
-        return (project_path / '.git').exists()
+        with self._cache_lock:
+            is_repo = self._is_repo_cache.get(project_id)
+        if is_repo is None:
+            is_repo = os.path.exists(os.path.join(self._get_project_path(project_id), '.git'))
+            with self._cache_lock:
+                self._is_repo_cache[project_id] = is_repo
+        return is_repo
     
     def init_repo(self, project_id: str) -> Tuple[bool, str]:
         """
@@ -104,7 +314,7 @@ class GitService:
         
         Returns (success, message).
         """
-        project_path = self._get_project_path(project_id)
+        project_path = Path(self._get_project_path(project_id))
         
         # Create directory if it doesn't exist
         project_path.mkdir(parents=True, exist_ok=True)
@@ -118,6 +328,9 @@ class GitService:
         if not success:
             return False, f"Failed to initialize: {stderr}"
         
+        with self._cache_lock:
+            self._is_repo_cache[project_id] = True
+        
         # Configure git user for this repo
         self._run_git(project_id, ['config', 'user.email', 'intelekt@local'])
         self._run_git(project_id, ['config', 'user.name', 'Intelekt'])
@@ -125,16 +338,17 @@ class GitService:
         # Create initial commit if there are files
         files = list(project_path.glob('*'))
         if files:
-            self._run_git(project_id, ['add', '-A'])
+            self._run_argv(project_id, _GIT_ADD_ALL_ARGV)
             self._run_git(project_id, ['commit', '-m', 'Initial commit'])
         
         return True, "Repository initialized successfully"
     
-    def get_status(self, project_id: str) -> Dict:
+    def get_status(self, project_id: str, untracked: UntrackedMode = 'normal') -> Dict:
         """
         Get the current git status.
         
-        Returns dict with staged, unstaged, and untracked files.
+        Returns dict with staged, unstaged, and untracked files. Pass
+        untracked='no' to skip the untracked-file scan on large trees.
         """
         if not self.is_git_repo(project_id):
             return {"error": "Not a git repository"}
@@ -146,38 +360,48 @@ class GitService:
             "has_changes": False
         }
         
-        # Get status
-        success, stdout, _ = self._run_git(
+        # NUL-separated entries keep paths unquoted; renames and copies are
+        # followed by an extra entry holding the original path
+        success, stdout, _ = self._run_argv(
             project_id, 
-            ['status', '--porcelain']
+            _GIT_STATUS_ARGV[untracked],
+            text=False
         )
         
         if not success:
             return result
         
-        for line in stdout.strip().split('\n'):
-            if not line:
+        entries = stdout.split(b'\0')
+        i = 0
+        while i < len(entries):
+            entry = entries[i]
+            i += 1
+            if len(entry) < 4:
                 continue
             
-            status = line[:2]
-            filepath = line[3:]
+            index_code = entry[0]
+            worktree_code = entry[1]
+            filepath = os.fsdecode(entry[3:])
+            if index_code in b'RC':
+                filepath = f"{os.fsdecode(entries[i])} -> {filepath}"
+                i += 1
             
             # Staged changes (index)
-            if status[0] in ['A', 'M', 'D', 'R']:
+            if index_code in b'AMDR':
                 result["staged"].append({
                     "path": filepath,
-                    "status": self._status_to_word(status[0])
+                    "status": _STATUS_TABLE[index_code]
                 })
             
             # Unstaged changes (working tree)
-            if status[1] in ['M', 'D']:
+            if worktree_code in b'MD':
                 result["unstaged"].append({
                     "path": filepath,
-                    "status": self._status_to_word(status[1])
+                    "status": _STATUS_TABLE[worktree_code]
                 })
             
             # Untracked files
-            if status == '??':
+            if index_code == worktree_code == 0x3f:  # '??'
                 result["untracked"].append(filepath)
         
         result["has_changes"] = bool(
@@ -186,16 +410,9 @@ class GitService:
         
         return result
     
-    def _status_to_word(self, status: str) -> str:
-        """Convert git status code to word."""
-        mapping = {
-            'A': 'added',
-            'M': 'modified',
-            'D': 'deleted',
-            'R': 'renamed',
-            '?': 'untracked'
-        }
-        return mapping.get(status, 'unknown')
+    def get_status_many(self, project_ids: List[str]) -> Dict[str, Dict]:
+        """Get the git status of several projects concurrently."""
+        return dict(zip(project_ids, self._get_pool().map(self.get_status, project_ids)))
     
     def add_files(
         self, 
@@ -213,7 +430,7 @@ class GitService:
         if files:
             success, _, stderr = self._run_git(project_id, ['add'] + files)
         else:
-            success, _, stderr = self._run_git(project_id, ['add', '-A'])
+            success, _, stderr = self._run_argv(project_id, _GIT_ADD_ALL_ARGV)
         
         if success:
             return True, "Files staged successfully"
@@ -238,29 +455,35 @@ class GitService:
         
         # Stage all changes if requested
         if add_all:
-            self._run_git(project_id, ['add', '-A'])
+            self._run_argv(project_id, _GIT_ADD_ALL_ARGV)
         
-        # Check if there's anything to commit
-        status = self.get_status(project_id)
-        if not status.get("staged"):
-            return False, "Nothing to commit", None
-        
-        # Create commit
+        # Create commit; git refuses when nothing is staged, which saves a
+        # separate status check beforehand
         success, stdout, stderr = self._run_git(
             project_id, 
             ['commit', '-m', message]
         )
         
         if not success:
+            # diff --quiet exits 0 only when the index matches HEAD, which
+            # tells an empty commit apart from a real failure without
+            # depending on git's (localized) messages
+            index_clean, _, _ = self._run_argv(
+                project_id,
+                _GIT_INDEX_CLEAN_ARGV
+            )
+            if index_clean:
+                return False, "Nothing to commit", None
             return False, f"Commit failed: {stderr}", None
         
-        # Get commit hash
-        success, hash_output, _ = self._run_git(
-            project_id, 
-            ['rev-parse', 'HEAD']
-        )
-        
-        commit_hash = hash_output.strip() if success else None
+        # Get commit hash; git just wrote it to the loose ref HEAD points at
+        commit_hash = self._read_head_commit(project_id)
+        if commit_hash is None:
+            success, hash_output, _ = self._run_argv(
+                project_id, 
+                _GIT_HEAD_HASH_ARGV
+            )
+            commit_hash = hash_output.strip() if success else None
         
         return True, "Commit created successfully", commit_hash
     
@@ -268,37 +491,43 @@ class GitService:
         self, 
         project_id: str, 
         limit: int = 50
-    ) -> List[Commit]:
-        """Get commit history."""
+    ) -> Iterator[Commit]:
+        """Get commit history, yielding commits as git writes them."""
         if not self.is_git_repo(project_id):
-            return []
-        
-        # Get log with custom format
-        format_str = '%H|%h|%s|%an|%ad'
-        success, stdout, _ = self._run_git(
-            project_id,
-            ['log', f'-{limit}', f'--format={format_str}', '--date=relative']
-        )
+            return
         
-        if not success:
-            return []
+        try:
+            proc = subprocess.Popen(
+                ['git', 'log', f'-{limit}', f'--format={_LOG_FORMAT}', '--date=relative'],
+                cwd=self._get_project_path(project_id),
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL
+            )
+        except Exception:
+            return
         
-        commits = []
-        for line in stdout.strip().split('\n'):
-            if not line:
-                continue
-            
-            parts = line.split('|')
-            if len(parts) >= 5:
-                commits.append(Commit(
-                    hash=parts[0],
-                    short_hash=parts[1],
-                    message=parts[2],
-                    author=parts[3],
-                    date=parts[4]
-                ))
-        
-        return commits
+        try:
+            # Records end in RS and fields are split by US, so subjects may
+            # contain any printable character
+            pending = b''
+            for chunk in iter(lambda: proc.stdout.read1(65536), b''):
+                records = (pending + chunk).split(b'\x1e')
+                pending = records.pop()
+                for record in records:
+                    parts = record.lstrip(b'\n').decode('utf-8', 'replace').split('\x1f')
+                    if len(parts) == 5:
+                        yield Commit(
+                            hash=parts[0],
+                            short_hash=parts[1],
+                            message=parts[2],
+                            author=parts[3],
+                            date=parts[4]
+                        )
+        finally:
+            if proc.poll() is None:
+                proc.kill()
+            proc.stdout.close()
+            proc.wait()
     
     def get_branches(self, project_id: str) -> List[Branch]:
         """Get all branches."""
@@ -381,45 +610,48 @@ class GitService:
             return []
         
         if commit:
-            args = ['diff', f'{commit}^..{commit}', '--numstat']
-        elif staged:
-            args = ['diff', '--cached', '--numstat']
+            patch_argv = ('git', 'diff', f'{commit}^..{commit}')
+            numstat_argv = patch_argv + _NUMSTAT_ARGS
         else:
-            args = ['diff', '--numstat']
+            patch_argv, numstat_argv = _GIT_DIFF_ARGV[staged]
         
-        success, stdout, _ = self._run_git(project_id, args)
+        # Both outputs stay bytes; only paths and patch text are decoded
+        success, stdout, _ = self._run_argv(project_id, numstat_argv, text=False)
         
-        if not success:
+        if not success or not stdout:
             return []
         
+        # All patches in one call; git emits them in the same order as numstat
+        _, patch_output, _ = self._run_argv(project_id, patch_argv, text=False)
+        patches = _DIFF_HEADER_RE.split(patch_output)[1:]
+        
         diffs = []
-        for line in stdout.strip().split('\n'):
-            if not line:
+        fields = stdout.split(b'\0')
+        i = 0
+        while i < len(fields):
+            parts = fields[i].split(b'\t')
+            i += 1
+            if len(parts) < 3:
                 continue
             
-            parts = line.split('\t')
-            if len(parts) >= 3:
-                additions = int(parts[0]) if parts[0] != '-' else 0
-                deletions = int(parts[1]) if parts[1] != '-' else 0
-                filepath = parts[2]
-                
-                # Get the actual diff content
-                if commit:
-                    diff_args = ['diff', f'{commit}^..{commit}', '--', filepath]
-                elif staged:
-                    diff_args = ['diff', '--cached', '--', filepath]
-                else:
-                    diff_args = ['diff', '--', filepath]
-                
-                _, diff_content, _ = self._run_git(project_id, diff_args)
-                
-                diffs.append(FileDiff(
-                    path=filepath,
-                    status='modified',
-                    additions=additions,
-                    deletions=deletions,
-                    diff_content=diff_content
-                ))
+            additions = int(parts[0]) if parts[0] != b'-' else 0
+            deletions = int(parts[1]) if parts[1] != b'-' else 0
+            filepath = parts[2]
+            
+            # Renames leave the path empty and follow with old and new paths
+            if not filepath:
+                filepath = fields[i + 1]
+                i += 2
+            
+            patch = patches[len(diffs)] if len(diffs) < len(patches) else b''
+            
+            diffs.append(FileDiff(
+                path=os.fsdecode(filepath),
+                status=_patch_status(patch),
+                additions=additions,
+                deletions=deletions,
+                diff_content=patch.decode('utf-8', 'replace')
+            ))
         
         return diffs
     
@@ -433,12 +665,39 @@ class GitService:
         if not self.is_git_repo(project_id):
             return None
         
+        # The batch protocol is line-based, so names with newlines go
+        # through a one-off git show
+        spec = f'{commit}:{filepath}'
+        if '\n' not in spec:
+            cat_file = None
+            try:
+                cat_file = self._get_cat_file(project_id)
+                found = cat_file.read(spec.encode())
+            except (OSError, ValueError):
+                if cat_file is not None:
+                    self._drop_cat_file(project_id, cat_file)
+            else:
+                if found is None:
+                    return None
+                obj_type, content = found
+                if obj_type == b'blob':
+                    try:
+                        return content.decode('utf-8')
+                    except UnicodeDecodeError:
+                        return None
+        
         success, stdout, _ = self._run_git(
             project_id, 
-            ['show', f'{commit}:{filepath}']
+            ['show', spec],
+            text=False
         )
         
-        return stdout if success else None
+        if not success:
+            return None
+        try:
+            return stdout.decode('utf-8')
+        except UnicodeDecodeError:
+            return None
     
     def discard_changes(
         self, 
@@ -464,17 +723,52 @@ class GitService:
             return True, "Changes discarded"
         return False, f"Failed to discard changes: {stderr}"
     
+    def _read_head(self, project_id: str) -> Optional[str]:
+        """Read .git/HEAD directly; None if it can't be read."""
+        try:
+            with open(os.path.join(self._get_project_path(project_id), '.git', 'HEAD')) as f:
+                return f.read().strip()
+        except OSError:
+            return None
+    
+    def _read_head_commit(self, project_id: str) -> Optional[str]:
+        """Resolve HEAD to a commit hash from loose refs; None if not found."""
+        head = self._read_head(project_id)
+        if not head:
+            return None
+        if not head.startswith('ref: '):
+            return head
+        
+        try:
+            with open(os.path.join(self._get_project_path(project_id), '.git', head[5:])) as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+    
     def get_current_branch(self, project_id: str) -> Optional[str]:
         """Get the current branch name."""
         if not self.is_git_repo(project_id):
             return None
         
-        success, stdout, _ = self._run_git(
+        # HEAD is either a symbolic ref or a detached commit hash, so the
+        # branch name can be read without spawning git
+        head = self._read_head(project_id)
+        if head:
+            if head.startswith('ref: refs/heads/'):
+                return head[16:]
+            if not head.startswith('ref: '):
+                return 'HEAD'
+        
+        success, stdout, _ = self._run_argv(
             project_id, 
-            ['rev-parse', '--abbrev-ref', 'HEAD']
+            _GIT_HEAD_BRANCH_ARGV
         )
         
         return stdout.strip() if success else None
+    
+    def get_current_branch_many(self, project_ids: List[str]) -> Dict[str, Optional[str]]:
+        """Get the current branch of several projects concurrently."""
+        return dict(zip(project_ids, self._get_pool().map(self.get_current_branch, project_ids)))
 
 
 # Singleton instance
@@ -5,12 +5,119 @@ Comprehensive GitHub integration for repository management,
 pull requests, issues, actions, and collaboration.
 """
 
+import asyncio
 import httpx
-from typing import Dict, List, Optional, Any
+import orjson
+import random
+import time
+from cachetools import LRUCache
+from typing import AsyncIterator, Dict, List, Optional, Any, Union
 from datetime import datetime
 from pydantic import BaseModel
-import base64
-import json
+import binascii
+
+
+# Seconds a cached GET response is served without asking GitHub again;
+# after that it is revalidated with its ETag (304s don't count against
+# the rate limit)
+GITHUB_CACHE_TTL = 60.0
+# Statistics and language breakdowns change slowly
+GITHUB_STATS_CACHE_TTL = 300.0
+
+# Concurrent GitHub requests issued by a single project push
+PUSH_CONCURRENCY = 20
+
+# Page size used when following every page of a list endpoint (GitHub's max)
+PAGINATE_PER_PAGE = 100
+
+# Bytes per chunk when streaming large downloads (raw files, logs)
+STREAM_CHUNK_SIZE = 65536
+
+# File contents larger than this are base64-encoded off the event loop
+ENCODE_IN_THREAD_SIZE = 1 << 20
+
+# GitHub's per-token budgets as (requests, per seconds)
+CORE_RATE_LIMIT = (5000, 3600.0)
+SEARCH_RATE_LIMIT = (30, 60.0)
+# Longest a request waits for rate-limit budget before failing locally
+MAX_RATE_LIMIT_WAIT = 30.0
+
+# Retries for transient failures (5xx, dropped connections, Retry-After)
+MAX_RETRIES = 4
+MAX_RETRY_BACKOFF = 30.0
+# Methods that are safe to resend after a 5xx or a mid-request network error.
+# PUT/DELETE are idempotent in HTTP terms, but GitHub answers a repeated
+# merge, contents PUT without sha or repo delete with 405/422/404, turning
+# a write that succeeded into a reported failure
+_IDEMPOTENT_METHODS = frozenset({"GET", "HEAD"})
+
+
+def _backoff(attempt: int) -> float:
+    """Exponential backoff with jitter for the given retry attempt."""
+    return min(2 ** attempt, MAX_RETRY_BACKOFF) + random.random()
+
+
+def _decode(content: bytes) -> Any:
+    """Decode a GitHub API response body."""
+    return orjson.loads(content) if content else {"success": True}
+
+
+def _b64encode(raw: bytes) -> str:
+    """Base64-encode file contents for the contents API."""
+    return binascii.b2a_base64(raw, newline=False).decode("ascii")
+
+
+class GitHubRateLimitError(Exception):
+    """Raised locally when a token's rate-limit budget won't refill in time."""
+
+
+class _TokenBucket:
+    """Token bucket pacing one token's requests to a GitHub rate limit."""
+    
+    def __init__(self, capacity: int, per_seconds: float):
+        self.capacity = capacity
+        self.rate = capacity / per_seconds
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        # Set when GitHub reports the budget spent; nothing goes out before it
+        self.resume_at = 0.0
+    
+    async def acquire(self) -> None:
+        """Take one request's worth of budget, sleeping for the shortfall."""
+        while True:
+            now = time.monotonic()
+            if self.resume_at:
+                if now < self.resume_at:
+                    wait = self.resume_at - now
+                else:
+                    # GitHub's window has reset with a full budget
+                    self.resume_at = 0.0
+                    self.tokens = float(self.capacity)
+                    self.updated = now
+                    continue
+            else:
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            
+            if wait > MAX_RATE_LIMIT_WAIT:
+                raise GitHubRateLimitError(f"GitHub API error: 403 - Rate limit exceeded, resets in {int(wait)}s")
+            await asyncio.sleep(wait)
+    
+    def sync(self, headers: httpx.Headers) -> None:
+        """Adopt GitHub's own remaining count from rate-limit headers."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is None:
+            return
+        remaining = int(remaining)
+        self.tokens = min(self.tokens, float(remaining))
+        if remaining == 0:
+            reset = headers.get("X-RateLimit-Reset")
+            reset_in = int(reset) - time.time() if reset else 60.0
+            self.resume_at = time.monotonic() + max(reset_in, 0.0)
 
 
 class GitHubService:
@@ -20,6 +127,18 @@ class GitHubService:
     
     def __init__(self):
         self.tokens: Dict[str, str] = {}  # user_id -> token
+        # Shared pooled client, created on first use so it binds to the
+        # running event loop; closed by aclose() at shutdown
+        self._client: Optional[httpx.AsyncClient] = None
+        # (endpoint, params, token) -> (expires_at, etag, raw body) for
+        # cacheable GETs; bodies are decoded per hit so callers own results
+        self._response_cache: LRUCache = LRUCache(maxsize=1024)
+        # (token, "core" | "search") -> local rate-limit bucket
+        self._buckets: LRUCache = LRUCache(maxsize=1024)
+        # token -> Authorization header dict
+        self._header_cache: LRUCache = LRUCache(maxsize=1024)
+        # (endpoint, params, token) -> task for GETs currently in flight
+        self._inflight: Dict[tuple, asyncio.Future] = {}
     
     def set_token(self, user_id: str, token: str):
         """Set GitHub token for a user."""
@@ -29,60 +148,288 @@ class GitHubService:
         """Get GitHub token for a user."""
         return self.tokens.get(user_id)
     
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared GitHub API client, reusing pooled connections."""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.BASE_URL,
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_keepalive_connections=50, max_connections=100),
+                headers={
+                    "Accept": "application/vnd.github+json",
+                    "X-GitHub-Api-Version": "2022-11-28"
+                },
+                # Bursts like push_project share one connection
+                http2=True
+            )
+        return self._client
+    
+    async def aclose(self) -> None:
+        """Close the shared GitHub API client."""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _rate_bucket(self, token: str, endpoint: str) -> _TokenBucket:
+        """Get the rate-limit bucket a request to endpoint draws from."""
+        kind = "search" if endpoint.startswith("/search") else "core"
+        bucket = self._buckets.get((token, kind))
+        if bucket is None:
+            limit = SEARCH_RATE_LIMIT if kind == "search" else CORE_RATE_LIMIT
+            bucket = self._buckets[(token, kind)] = _TokenBucket(*limit)
+        return bucket
+    
     def _get_headers(self, token: str) -> Dict[str, str]:
-        """Get headers for GitHub API requests."""
-        return {
-            "Authorization": f"Bearer {token}",
-            "Accept": "application/vnd.github+json",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
+        """
+        Get per-request headers for GitHub API requests.
+        
+        Accept and API version are client defaults, so this is just the
+        Authorization header, built once per token. Copy before modifying.
+        """
+        headers = self._header_cache.get(token)
+        if headers is None:
+            headers = self._header_cache[token] = {"Authorization": f"Bearer {token}"}
+        return headers
     
-    async def _request(
+    async def _send(
         self,
         method: str,
         endpoint: str,
         token: str,
-        data: Optional[Dict] = None,
-        params: Optional[Dict] = None
-    ) -> Dict[str, Any]:
-        """Make a request to GitHub API."""
-        url = f"{self.BASE_URL}{endpoint}"
+        bucket: Optional[_TokenBucket] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send one request through the shared client, paced by the token's rate limit.
+        
+        bucket overrides the rate-limit bucket picked from endpoint (needed
+        for absolute URLs such as pagination links).
+        
+        Secondary rate limits (403/429 with Retry-After) are waited out. 5xx
+        responses and network errors are retried with backoff for GET/HEAD;
+        writes are only resent if they never reached GitHub.
+        """
+        if bucket is None:
+            bucket = self._rate_bucket(token, endpoint)
+        kwargs.setdefault("headers", self._get_headers(token))
+        idempotent = method in _IDEMPOTENT_METHODS
+        
+        attempt = 0
+        while True:
+            await bucket.acquire()
+            try:
+                response = await self._get_client().request(method, endpoint, **kwargs)
+            except httpx.TransportError as e:
+                unsent = isinstance(e, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if attempt >= MAX_RETRIES or not (idempotent or unsent):
+                    raise
+                await asyncio.sleep(_backoff(attempt))
+                attempt += 1
+                continue
+            bucket.sync(response.headers)
+            
+            if attempt < MAX_RETRIES:
+                status = response.status_code
+                retry_after = response.headers.get("Retry-After", "")
+                if status in (403, 429) and retry_after.isdigit():
+                    if int(retry_after) <= MAX_RATE_LIMIT_WAIT:
+                        await asyncio.sleep(int(retry_after))
+                        attempt += 1
+                        continue
+                elif status >= 500 and idempotent:
+                    await asyncio.sleep(_backoff(attempt))
+                    attempt += 1
+                    continue
+            
+            return response
+    
+    def _raise_for_status(self, response: httpx.Response) -> None:
+        """Raise the GitHub API error carried by an error response."""
+        if response.status_code >= 400:
+            error_data = orjson.loads(response.content) if response.content else {}
+            raise Exception(f"GitHub API error: {response.status_code} - {error_data.get('message', 'Unknown error')}")
+    
+    def _result(self, response: httpx.Response) -> Any:
+        """Decode a GitHub API response, raising on error statuses."""
+        self._raise_for_status(response)
+        return _decode(response.content)
+    
+    async def _get(
+        self,
+        endpoint: str,
+        token: str,
+        params: Optional[Dict] = None,
+        cache_ttl: float = 0
+    ) -> Any:
+        """
+        GET from the GitHub API.
+        
+        With a cache_ttl the response is served from cache for that many
+        seconds, then revalidated with If-None-Match. Concurrent identical
+        GETs share one request.
+        """
+        key = (endpoint, tuple(sorted(params.items())) if params else (), token)
+        cached = self._response_cache.get(key) if cache_ttl else None
+        if cached is not None and time.monotonic() < cached[0]:
+            return _decode(cached[2])
+        
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch(key, endpoint, token, params, cache_ttl, cached))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # One caller being cancelled must not cancel the request for the rest.
+        # Each caller decodes its own copy so mutating a result can't leak
+        # into the cache or other callers
+        return _decode(await asyncio.shield(task))
+    
+    async def _fetch(
+        self,
+        key: tuple,
+        endpoint: str,
+        token: str,
+        params: Optional[Dict],
+        cache_ttl: float,
+        cached: Optional[tuple]
+    ) -> bytes:
+        """Issue a GET for _get and return the raw body, revalidating and storing cache entries."""
         headers = self._get_headers(token)
+        if cached is not None and cached[1]:
+            headers = {**headers, "If-None-Match": cached[1]}
+        
+        response = await self._send("GET", endpoint, token, params=params, headers=headers)
         
-        async with httpx.AsyncClient() as client:
-            response = await client.request(
-                method=method,
-                url=url,
-                headers=headers,
-                json=data,
-                params=params,
-                timeout=30.0
+        if cached is not None and response.status_code == 304:
+            self._response_cache[key] = (time.monotonic() + cache_ttl, cached[1], cached[2])
+            return cached[2]
+        
+        self._raise_for_status(response)
+        # 202 means GitHub is still computing (e.g. stats); don't keep it
+        if cache_ttl and response.status_code == 200:
+            self._response_cache[key] = (
+                time.monotonic() + cache_ttl,
+                response.headers.get("ETag"),
+                response.content
             )
-            
+        return response.content
+    
+    async def paginate(
+        self,
+        endpoint: str,
+        token: str,
+        params: Optional[Dict] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield every item of a list endpoint, following Link rel="next".
+        
+        The next page is fetched while the caller consumes the current one.
+        """
+        # Next links are absolute URLs; charge them to the endpoint's bucket
+        bucket = self._rate_bucket(token, endpoint)
+        pending = asyncio.ensure_future(self._send("GET", endpoint, token, bucket, params=params))
+        try:
+            while pending is not None:
+                response = await pending
+                items = self._result(response)
+                next_link = response.links.get("next")
+                pending = asyncio.ensure_future(self._send("GET", next_link["url"], token, bucket)) if next_link else None
+                for item in items:
+                    yield item
+        finally:
+            if pending is not None:
+                pending.cancel()
+    
+    async def _write(self, method: str, endpoint: str, token: str, data: Optional[Dict]) -> Any:
+        """Send a modifying request with an optional JSON body."""
+        if data is None:
+            response = await self._send(method, endpoint, token)
+        else:
+            response = await self._send(
+                method,
+                endpoint,
+                token,
+                content=orjson.dumps(data),
+                headers={**self._get_headers(token), "Content-Type": "application/json"}
+            )
+        
+        result = self._result(response)
+        self._forget_cached(token)
+        return result
+    
+    async def _post_json(self, endpoint: str, token: str, data: Optional[Dict] = None) -> Any:
+        """POST to the GitHub API."""
+        return await self._write("POST", endpoint, token, data)
+    
+    async def _put_json(self, endpoint: str, token: str, data: Optional[Dict] = None) -> Any:
+        """PUT to the GitHub API."""
+        return await self._write("PUT", endpoint, token, data)
+    
+    async def _patch_json(self, endpoint: str, token: str, data: Optional[Dict] = None) -> Any:
+        """PATCH the GitHub API."""
+        return await self._write("PATCH", endpoint, token, data)
+    
+    async def _delete(self, endpoint: str, token: str, data: Optional[Dict] = None) -> Any:
+        """DELETE on the GitHub API (contents deletes carry a body)."""
+        return await self._write("DELETE", endpoint, token, data)
+    
+    async def stream_request(
+        self,
+        method: str,
+        endpoint: str,
+        token: Optional[str],
+        params: Optional[Dict] = None,
+        accept: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """
+        Make a request and yield the response body in chunks.
+        
+        endpoint may also be an absolute URL (e.g. a signed download link,
+        fetched with token=None). Errors are raised on first iteration.
+        """
+        headers = self._get_headers(token) if token else {}
+        if accept:
+            headers = {**headers, "Accept": accept}
+        
+        bucket = self._rate_bucket(token, endpoint) if token else None
+        if bucket:
+            await bucket.acquire()
+        
+        async with self._get_client().stream(method, endpoint, headers=headers, params=params) as response:
+            if bucket:
+                bucket.sync(response.headers)
             if response.status_code >= 400:
-                error_data = response.json() if response.content else {}
+                await response.aread()
+                error_data = orjson.loads(response.content) if response.content else {}
                 raise Exception(f"GitHub API error: {response.status_code} - {error_data.get('message', 'Unknown error')}")
             
-            if response.content:
-                return response.json()
-            return {"success": True}
+            async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                yield chunk
+    
+    async def _head(self, endpoint: str, token: str) -> int:
+        """Make a HEAD request and return just the status code."""
+        return (await self._send("HEAD", endpoint, token)).status_code
+    
+    def _forget_cached(self, token: str) -> None:
+        """Drop cached responses for a token after it changed something."""
+        for key in [key for key in self._response_cache if key[2] == token]:
+            del self._response_cache[key]
     
     # ============== USER & AUTH ==============
     
     async def get_authenticated_user(self, token: str) -> Dict[str, Any]:
         """Get the authenticated user's profile."""
-        return await self._request("GET", "/user", token)
+        return await self._get("/user", token)
     
     async def get_user(self, token: str, username: str) -> Dict[str, Any]:
         """Get a user's public profile."""
-        return await self._request("GET", f"/users/{username}", token)
+        return await self._get(f"/users/{username}", token)
     
     async def validate_token(self, token: str) -> bool:
         """Validate if a token is valid."""
         try:
-            await self.get_authenticated_user(token)
-            return True
-        except:
+            return await self._head("/user", token) < 400
+        except (httpx.TransportError, GitHubRateLimitError):
+            # Can't be checked right now; report it as unusable as before
             return False
     
     # ============== REPOSITORIES ==============
@@ -102,11 +449,11 @@ class GitHubService:
             "per_page": per_page,
             "page": page
         }
-        return await self._request("GET", "/user/repos", token, params=params)
+        return await self._get("/user/repos", token, params=params, cache_ttl=GITHUB_CACHE_TTL)
     
     async def get_repo(self, token: str, owner: str, repo: str) -> Dict[str, Any]:
         """Get a repository."""
-        return await self._request("GET", f"/repos/{owner}/{repo}", token)
+        return await self._get(f"/repos/{owner}/{repo}", token, cache_ttl=GITHUB_CACHE_TTL)
     
     async def create_repo(
         self,
@@ -130,11 +477,11 @@ class GitHubService:
         if license_template:
             data["license_template"] = license_template
         
-        return await self._request("POST", "/user/repos", token, data=data)
+        return await self._post_json("/user/repos", token, data=data)
     
     async def delete_repo(self, token: str, owner: str, repo: str) -> Dict[str, Any]:
         """Delete a repository."""
-        return await self._request("DELETE", f"/repos/{owner}/{repo}", token)
+        return await self._delete(f"/repos/{owner}/{repo}", token)
     
     async def fork_repo(
         self,
@@ -151,7 +498,7 @@ class GitHubService:
         if name:
             data["name"] = name
         
-        return await self._request("POST", f"/repos/{owner}/{repo}/forks", token, data=data or None)
+        return await self._post_json(f"/repos/{owner}/{repo}/forks", token, data=data or None)
     
     async def search_repos(
         self,
@@ -168,7 +515,7 @@ class GitHubService:
             "order": order,
             "per_page": per_page
         }
-        return await self._request("GET", "/search/repositories", token, params=params)
+        return await self._get("/search/repositories", token, params=params)
     
     # ============== BRANCHES ==============
     
@@ -181,7 +528,7 @@ class GitHubService:
     ) -> List[Dict[str, Any]]:
         """List branches in a repository."""
         params = {"per_page": per_page}
-        return await self._request("GET", f"/repos/{owner}/{repo}/branches", token, params=params)
+        return await self._get(f"/repos/{owner}/{repo}/branches", token, params=params, cache_ttl=GITHUB_CACHE_TTL)
     
     async def get_branch(
         self,
@@ -191,7 +538,7 @@ class GitHubService:
         branch: str
     ) -> Dict[str, Any]:
         """Get a specific branch."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/branches/{branch}", token)
+        return await self._get(f"/repos/{owner}/{repo}/branches/{branch}", token)
     
     async def create_branch(
         self,
@@ -211,7 +558,7 @@ class GitHubService:
             "ref": f"refs/heads/{branch_name}",
             "sha": sha
         }
-        return await self._request("POST", f"/repos/{owner}/{repo}/git/refs", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/git/refs", token, data=data)
     
     async def delete_branch(
         self,
@@ -221,7 +568,7 @@ class GitHubService:
         branch: str
     ) -> Dict[str, Any]:
         """Delete a branch."""
-        return await self._request("DELETE", f"/repos/{owner}/{repo}/git/refs/heads/{branch}", token)
+        return await self._delete(f"/repos/{owner}/{repo}/git/refs/heads/{branch}", token)
     
     async def merge_branches(
         self,
@@ -240,7 +587,7 @@ class GitHubService:
         if commit_message:
             data["commit_message"] = commit_message
         
-        return await self._request("POST", f"/repos/{owner}/{repo}/merges", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/merges", token, data=data)
     
     # ============== COMMITS ==============
     
@@ -257,7 +604,20 @@ class GitHubService:
         params = {"per_page": per_page, "page": page}
         if branch:
             params["sha"] = branch
-        return await self._request("GET", f"/repos/{owner}/{repo}/commits", token, params=params)
+        return await self._get(f"/repos/{owner}/{repo}/commits", token, params=params)
+    
+    def iter_commits(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        branch: Optional[str] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all commits in a repository, page by page."""
+        params = {"per_page": PAGINATE_PER_PAGE}
+        if branch:
+            params["sha"] = branch
+        return self.paginate(f"/repos/{owner}/{repo}/commits", token, params=params)
     
     async def get_commit(
         self,
@@ -267,7 +627,7 @@ class GitHubService:
         ref: str
     ) -> Dict[str, Any]:
         """Get a specific commit."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/commits/{ref}", token)
+        return await self._get(f"/repos/{owner}/{repo}/commits/{ref}", token)
     
     async def compare_commits(
         self,
@@ -278,7 +638,7 @@ class GitHubService:
         head: str
     ) -> Dict[str, Any]:
         """Compare two commits."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/compare/{base}...{head}", token)
+        return await self._get(f"/repos/{owner}/{repo}/compare/{base}...{head}", token)
     
     # ============== FILES & CONTENTS ==============
     
@@ -294,7 +654,25 @@ class GitHubService:
         params = {}
         if ref:
             params["ref"] = ref
-        return await self._request("GET", f"/repos/{owner}/{repo}/contents/{path}", token, params=params)
+        return await self._get(f"/repos/{owner}/{repo}/contents/{path}", token, params=params)
+    
+    def stream_contents(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        path: str,
+        ref: Optional[str] = None
+    ) -> AsyncIterator[bytes]:
+        """Stream a file's raw bytes (no JSON or base64 wrapping)."""
+        params = {"ref": ref} if ref else None
+        return self.stream_request(
+            "GET",
+            f"/repos/{owner}/{repo}/contents/{path}",
+            token,
+            params=params,
+            accept="application/vnd.github.raw+json"
+        )
     
     async def create_or_update_file(
         self,
@@ -302,22 +680,28 @@ class GitHubService:
         owner: str,
         repo: str,
         path: str,
-        content: str,
+        content: Union[str, bytes],
         message: str,
         branch: Optional[str] = None,
         sha: Optional[str] = None
     ) -> Dict[str, Any]:
-        """Create or update a file in the repository."""
+        """Create or update a file in the repository (bytes are sent as-is)."""
+        raw = content.encode() if isinstance(content, str) else content
+        if len(raw) > ENCODE_IN_THREAD_SIZE:
+            encoded = await asyncio.to_thread(_b64encode, raw)
+        else:
+            encoded = _b64encode(raw)
+        
         data = {
             "message": message,
-            "content": base64.b64encode(content.encode()).decode()
+            "content": encoded
         }
         if branch:
             data["branch"] = branch
         if sha:
             data["sha"] = sha
         
-        return await self._request("PUT", f"/repos/{owner}/{repo}/contents/{path}", token, data=data)
+        return await self._put_json(f"/repos/{owner}/{repo}/contents/{path}", token, data=data)
     
     async def delete_file(
         self,
@@ -337,7 +721,7 @@ class GitHubService:
         if branch:
             data["branch"] = branch
         
-        return await self._request("DELETE", f"/repos/{owner}/{repo}/contents/{path}", token, data=data)
+        return await self._delete(f"/repos/{owner}/{repo}/contents/{path}", token, data=data)
     
     async def get_readme(
         self,
@@ -346,7 +730,7 @@ class GitHubService:
         repo: str
     ) -> Dict[str, Any]:
         """Get the README of a repository."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/readme", token)
+        return await self._get(f"/repos/{owner}/{repo}/readme", token)
     
     # ============== PULL REQUESTS ==============
     
@@ -367,7 +751,7 @@ class GitHubService:
             "direction": direction,
             "per_page": per_page
         }
-        return await self._request("GET", f"/repos/{owner}/{repo}/pulls", token, params=params)
+        return await self._get(f"/repos/{owner}/{repo}/pulls", token, params=params)
     
     async def get_pull_request(
         self,
@@ -377,7 +761,7 @@ class GitHubService:
         pull_number: int
     ) -> Dict[str, Any]:
         """Get a specific pull request."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/pulls/{pull_number}", token)
+        return await self._get(f"/repos/{owner}/{repo}/pulls/{pull_number}", token)
     
     async def create_pull_request(
         self,
@@ -398,7 +782,7 @@ class GitHubService:
             "body": body,
             "draft": draft
         }
-        return await self._request("POST", f"/repos/{owner}/{repo}/pulls", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/pulls", token, data=data)
     
     async def update_pull_request(
         self,
@@ -422,7 +806,7 @@ class GitHubService:
         if base:
             data["base"] = base
         
-        return await self._request("PATCH", f"/repos/{owner}/{repo}/pulls/{pull_number}", token, data=data)
+        return await self._patch_json(f"/repos/{owner}/{repo}/pulls/{pull_number}", token, data=data)
     
     async def merge_pull_request(
         self,
@@ -441,7 +825,7 @@ class GitHubService:
         if commit_message:
             data["commit_message"] = commit_message
         
-        return await self._request("PUT", f"/repos/{owner}/{repo}/pulls/{pull_number}/merge", token, data=data)
+        return await self._put_json(f"/repos/{owner}/{repo}/pulls/{pull_number}/merge", token, data=data)
     
     async def list_pr_files(
         self,
@@ -451,7 +835,7 @@ class GitHubService:
         pull_number: int
     ) -> List[Dict[str, Any]]:
         """List files changed in a pull request."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/pulls/{pull_number}/files", token)
+        return await self._get(f"/repos/{owner}/{repo}/pulls/{pull_number}/files", token)
     
     async def list_pr_commits(
         self,
@@ -461,7 +845,7 @@ class GitHubService:
         pull_number: int
     ) -> List[Dict[str, Any]]:
         """List commits in a pull request."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/pulls/{pull_number}/commits", token)
+        return await self._get(f"/repos/{owner}/{repo}/pulls/{pull_number}/commits", token)
     
     async def create_pr_review(
         self,
@@ -481,7 +865,7 @@ class GitHubService:
         if comments:
             data["comments"] = comments
         
-        return await self._request("POST", f"/repos/{owner}/{repo}/pulls/{pull_number}/reviews", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/pulls/{pull_number}/reviews", token, data=data)
     
     # ============== ISSUES ==============
     
@@ -509,7 +893,18 @@ class GitHubService:
         if assignee:
             params["assignee"] = assignee
         
-        return await self._request("GET", f"/repos/{owner}/{repo}/issues", token, params=params)
+        return await self._get(f"/repos/{owner}/{repo}/issues", token, params=params, cache_ttl=GITHUB_CACHE_TTL)
+    
+    def iter_issues(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        state: str = "open"
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Iterate over all issues in a repository, page by page."""
+        params = {"state": state, "per_page": PAGINATE_PER_PAGE}
+        return self.paginate(f"/repos/{owner}/{repo}/issues", token, params=params)
     
     async def get_issue(
         self,
@@ -519,7 +914,7 @@ class GitHubService:
         issue_number: int
     ) -> Dict[str, Any]:
         """Get a specific issue."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/issues/{issue_number}", token)
+        return await self._get(f"/repos/{owner}/{repo}/issues/{issue_number}", token)
     
     async def create_issue(
         self,
@@ -544,7 +939,7 @@ class GitHubService:
         if milestone:
             data["milestone"] = milestone
         
-        return await self._request("POST", f"/repos/{owner}/{repo}/issues", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/issues", token, data=data)
     
     async def update_issue(
         self,
@@ -571,7 +966,7 @@ class GitHubService:
         if assignees is not None:
             data["assignees"] = assignees
         
-        return await self._request("PATCH", f"/repos/{owner}/{repo}/issues/{issue_number}", token, data=data)
+        return await self._patch_json(f"/repos/{owner}/{repo}/issues/{issue_number}", token, data=data)
     
     async def add_issue_comment(
         self,
@@ -583,7 +978,7 @@ class GitHubService:
     ) -> Dict[str, Any]:
         """Add a comment to an issue."""
         data = {"body": body}
-        return await self._request("POST", f"/repos/{owner}/{repo}/issues/{issue_number}/comments", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/issues/{issue_number}/comments", token, data=data)
     
     async def list_issue_comments(
         self,
@@ -593,7 +988,7 @@ class GitHubService:
         issue_number: int
     ) -> List[Dict[str, Any]]:
         """List comments on an issue."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/issues/{issue_number}/comments", token)
+        return await self._get(f"/repos/{owner}/{repo}/issues/{issue_number}/comments", token)
     
     # ============== LABELS ==============
     
@@ -604,7 +999,7 @@ class GitHubService:
         repo: str
     ) -> List[Dict[str, Any]]:
         """List labels in a repository."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/labels", token)
+        return await self._get(f"/repos/{owner}/{repo}/labels", token)
     
     async def create_label(
         self,
@@ -621,7 +1016,7 @@ class GitHubService:
             "color": color.lstrip("#"),
             "description": description
         }
-        return await self._request("POST", f"/repos/{owner}/{repo}/labels", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/labels", token, data=data)
     
     # ============== GITHUB ACTIONS ==============
     
@@ -632,7 +1027,7 @@ class GitHubService:
         repo: str
     ) -> Dict[str, Any]:
         """List workflows in a repository."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/actions/workflows", token)
+        return await self._get(f"/repos/{owner}/{repo}/actions/workflows", token)
     
     async def get_workflow(
         self,
@@ -642,7 +1037,7 @@ class GitHubService:
         workflow_id: str
     ) -> Dict[str, Any]:
         """Get a specific workflow."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/actions/workflows/{workflow_id}", token)
+        return await self._get(f"/repos/{owner}/{repo}/actions/workflows/{workflow_id}", token)
     
     async def trigger_workflow(
         self,
@@ -658,7 +1053,7 @@ class GitHubService:
         if inputs:
             data["inputs"] = inputs
         
-        return await self._request("POST", f"/repos/{owner}/{repo}/actions/workflows/{workflow_id}/dispatches", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/actions/workflows/{workflow_id}/dispatches", token, data=data)
     
     async def list_workflow_runs(
         self,
@@ -679,7 +1074,7 @@ class GitHubService:
         else:
             endpoint = f"/repos/{owner}/{repo}/actions/runs"
         
-        return await self._request("GET", endpoint, token, params=params)
+        return await self._get(endpoint, token, params=params)
     
     async def get_workflow_run(
         self,
@@ -689,7 +1084,7 @@ class GitHubService:
         run_id: int
     ) -> Dict[str, Any]:
         """Get a specific workflow run."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/actions/runs/{run_id}", token)
+        return await self._get(f"/repos/{owner}/{repo}/actions/runs/{run_id}", token)
     
     async def cancel_workflow_run(
         self,
@@ -699,7 +1094,7 @@ class GitHubService:
         run_id: int
     ) -> Dict[str, Any]:
         """Cancel a workflow run."""
-        return await self._request("POST", f"/repos/{owner}/{repo}/actions/runs/{run_id}/cancel", token)
+        return await self._post_json(f"/repos/{owner}/{repo}/actions/runs/{run_id}/cancel", token)
     
     async def rerun_workflow(
         self,
@@ -709,7 +1104,7 @@ class GitHubService:
         run_id: int
     ) -> Dict[str, Any]:
         """Re-run a workflow."""
-        return await self._request("POST", f"/repos/{owner}/{repo}/actions/runs/{run_id}/rerun", token)
+        return await self._post_json(f"/repos/{owner}/{repo}/actions/runs/{run_id}/rerun", token)
     
     async def list_workflow_jobs(
         self,
@@ -719,7 +1114,7 @@ class GitHubService:
         run_id: int
     ) -> Dict[str, Any]:
         """List jobs for a workflow run."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/actions/runs/{run_id}/jobs", token)
+        return await self._get(f"/repos/{owner}/{repo}/actions/runs/{run_id}/jobs", token)
     
     async def get_workflow_logs(
         self,
@@ -729,14 +1124,32 @@ class GitHubService:
         run_id: int
     ) -> str:
         """Get logs for a workflow run (returns download URL)."""
-        url = f"{self.BASE_URL}/repos/{owner}/{repo}/actions/runs/{run_id}/logs"
-        headers = self._get_headers(token)
+        response = await self._send(
+            "GET",
+            f"/repos/{owner}/{repo}/actions/runs/{run_id}/logs",
+            token,
+            follow_redirects=False
+        )
+        if response.status_code == 302:
+            return response.headers.get("Location", "")
+        self._raise_for_status(response)
+        return ""
+    
+    async def stream_workflow_logs(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        run_id: int
+    ) -> AsyncIterator[bytes]:
+        """Stream the zipped logs archive for a workflow run."""
+        url = await self.get_workflow_logs(token, owner, repo, run_id)
+        if not url:
+            raise Exception("GitHub API error: 404 - Workflow logs not available")
         
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, headers=headers, follow_redirects=False)
-            if response.status_code == 302:
-                return response.headers.get("Location", "")
-            return ""
+        # The redirect target is a pre-signed URL; don't send the token there
+        async for chunk in self.stream_request("GET", url, None):
+            yield chunk
     
     # ============== COLLABORATORS ==============
     
@@ -747,7 +1160,7 @@ class GitHubService:
         repo: str
     ) -> List[Dict[str, Any]]:
         """List repository collaborators."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/collaborators", token)
+        return await self._get(f"/repos/{owner}/{repo}/collaborators", token)
     
     async def add_collaborator(
         self,
@@ -759,7 +1172,7 @@ class GitHubService:
     ) -> Dict[str, Any]:
         """Add a collaborator to a repository."""
         data = {"permission": permission}
-        return await self._request("PUT", f"/repos/{owner}/{repo}/collaborators/{username}", token, data=data)
+        return await self._put_json(f"/repos/{owner}/{repo}/collaborators/{username}", token, data=data)
     
     async def remove_collaborator(
         self,
@@ -769,7 +1182,7 @@ class GitHubService:
         username: str
     ) -> Dict[str, Any]:
         """Remove a collaborator from a repository."""
-        return await self._request("DELETE", f"/repos/{owner}/{repo}/collaborators/{username}", token)
+        return await self._delete(f"/repos/{owner}/{repo}/collaborators/{username}", token)
     
     # ============== RELEASES ==============
     
@@ -782,7 +1195,7 @@ class GitHubService:
     ) -> List[Dict[str, Any]]:
         """List releases."""
         params = {"per_page": per_page}
-        return await self._request("GET", f"/repos/{owner}/{repo}/releases", token, params=params)
+        return await self._get(f"/repos/{owner}/{repo}/releases", token, params=params)
     
     async def get_latest_release(
         self,
@@ -791,7 +1204,7 @@ class GitHubService:
         repo: str
     ) -> Dict[str, Any]:
         """Get the latest release."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/releases/latest", token)
+        return await self._get(f"/repos/{owner}/{repo}/releases/latest", token)
     
     async def create_release(
         self,
@@ -814,7 +1227,7 @@ class GitHubService:
             "prerelease": prerelease,
             "target_commitish": target_commitish
         }
-        return await self._request("POST", f"/repos/{owner}/{repo}/releases", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/releases", token, data=data)
     
     # ============== WEBHOOKS ==============
     
@@ -825,7 +1238,7 @@ class GitHubService:
         repo: str
     ) -> List[Dict[str, Any]]:
         """List repository webhooks."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/hooks", token)
+        return await self._get(f"/repos/{owner}/{repo}/hooks", token)
     
     async def create_webhook(
         self,
@@ -854,7 +1267,7 @@ class GitHubService:
         if secret:
             data["config"]["secret"] = secret
         
-        return await self._request("POST", f"/repos/{owner}/{repo}/hooks", token, data=data)
+        return await self._post_json(f"/repos/{owner}/{repo}/hooks", token, data=data)
     
     async def delete_webhook(
         self,
@@ -864,7 +1277,7 @@ class GitHubService:
         hook_id: int
     ) -> Dict[str, Any]:
         """Delete a webhook."""
-        return await self._request("DELETE", f"/repos/{owner}/{repo}/hooks/{hook_id}", token)
+        return await self._delete(f"/repos/{owner}/{repo}/hooks/{hook_id}", token)
     
     # ============== NOTIFICATIONS ==============
     
@@ -879,18 +1292,18 @@ class GitHubService:
             "all": all_notifications,
             "participating": participating
         }
-        return await self._request("GET", "/notifications", token, params=params)
+        return await self._get("/notifications", token, params=params)
     
     async def mark_notifications_read(self, token: str) -> Dict[str, Any]:
         """Mark all notifications as read."""
-        return await self._request("PUT", "/notifications", token, data={"read": True})
+        return await self._put_json("/notifications", token, data={"read": True})
     
     # ============== GISTS ==============
     
     async def list_gists(self, token: str, per_page: int = 30) -> List[Dict[str, Any]]:
         """List gists for the authenticated user."""
         params = {"per_page": per_page}
-        return await self._request("GET", "/gists", token, params=params)
+        return await self._get("/gists", token, params=params)
     
     async def create_gist(
         self,
@@ -905,7 +1318,7 @@ class GitHubService:
             "public": public,
             "files": files
         }
-        return await self._request("POST", "/gists", token, data=data)
+        return await self._post_json("/gists", token, data=data)
     
     # ============== STATS & INSIGHTS ==============
     
@@ -916,7 +1329,7 @@ class GitHubService:
         repo: str
     ) -> List[Dict[str, Any]]:
         """Get contributor statistics."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/stats/contributors", token)
+        return await self._get(f"/repos/{owner}/{repo}/stats/contributors", token, cache_ttl=GITHUB_STATS_CACHE_TTL)
     
     async def get_commit_activity(
         self,
@@ -925,7 +1338,7 @@ class GitHubService:
         repo: str
     ) -> List[Dict[str, Any]]:
         """Get commit activity for the last year."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/stats/commit_activity", token)
+        return await self._get(f"/repos/{owner}/{repo}/stats/commit_activity", token, cache_ttl=GITHUB_STATS_CACHE_TTL)
     
     async def get_code_frequency(
         self,
@@ -934,7 +1347,7 @@ class GitHubService:
         repo: str
     ) -> List[List[int]]:
         """Get code frequency statistics."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/stats/code_frequency", token)
+        return await self._get(f"/repos/{owner}/{repo}/stats/code_frequency", token, cache_ttl=GITHUB_STATS_CACHE_TTL)
     
     async def get_languages(
         self,
@@ -943,7 +1356,7 @@ class GitHubService:
         repo: str
     ) -> Dict[str, int]:
         """Get repository languages."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/languages", token)
+        return await self._get(f"/repos/{owner}/{repo}/languages", token, cache_ttl=GITHUB_STATS_CACHE_TTL)
     
     async def get_community_profile(
         self,
@@ -952,7 +1365,72 @@ class GitHubService:
         repo: str
     ) -> Dict[str, Any]:
         """Get community profile metrics."""
-        return await self._request("GET", f"/repos/{owner}/{repo}/community/profile", token)
+        return await self._get(f"/repos/{owner}/{repo}/community/profile", token, cache_ttl=GITHUB_STATS_CACHE_TTL)
+    
+    # ============== GIT DATA ==============
+    
+    async def create_blob(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        content: str,
+        encoding: str = "utf-8"  # utf-8, base64
+    ) -> Dict[str, Any]:
+        """Create a blob."""
+        data = {
+            "content": content,
+            "encoding": encoding
+        }
+        return await self._post_json(f"/repos/{owner}/{repo}/git/blobs", token, data=data)
+    
+    async def create_tree(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        tree: List[Dict[str, Any]],
+        base_tree: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Create a tree, optionally on top of an existing one."""
+        data = {"tree": tree}
+        if base_tree:
+            data["base_tree"] = base_tree
+        
+        return await self._post_json(f"/repos/{owner}/{repo}/git/trees", token, data=data)
+    
+    async def create_commit(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        message: str,
+        tree: str,
+        parents: List[str]
+    ) -> Dict[str, Any]:
+        """Create a commit object."""
+        data = {
+            "message": message,
+            "tree": tree,
+            "parents": parents
+        }
+        return await self._post_json(f"/repos/{owner}/{repo}/git/commits", token, data=data)
+    
+    async def update_ref(
+        self,
+        token: str,
+        owner: str,
+        repo: str,
+        branch: str,
+        sha: str,
+        force: bool = False
+    ) -> Dict[str, Any]:
+        """Point a branch at a commit."""
+        data = {
+            "sha": sha,
+            "force": force
+        }
+        return await self._patch_json(f"/repos/{owner}/{repo}/git/refs/heads/{branch}", token, data=data)
     
     # ============== PROJECT PUSH ==============
     
@@ -986,17 +1464,25 @@ class GitHubService:
             "commit_message": commit_message
         }
         
-        for file_path, content in files.items():
-            try:
-                # Check if file exists to get its SHA
-                sha = None
+        # Look up existing file SHAs concurrently; the writes themselves stay
+        # sequential because parallel contents-API commits to one branch
+        # conflict with each other
+        semaphore = asyncio.Semaphore(PUSH_CONCURRENCY)
+        
+        async def existing_sha(file_path: str) -> Optional[str]:
+            async with semaphore:
                 try:
                     existing = await self.get_contents(token, owner, repo, file_path, ref=branch)
-                    if isinstance(existing, dict) and "sha" in existing:
-                        sha = existing["sha"]
-                except:
-                    pass  # File doesn't exist, will create new
-                
+                except Exception:
+                    return None  # File doesn't exist, will create new
+            if isinstance(existing, dict):
+                return existing.get("sha")
+            return None
+        
+        shas = await asyncio.gather(*(existing_sha(file_path) for file_path in files))
+        
+        for (file_path, content), sha in zip(files.items(), shas):
+            try:
                 # Create or update the file
                 await self.create_or_update_file(
                     token=token,
@@ -1047,64 +1533,34 @@ class GitHubService:
             base_sha = branch_info["commit"]["sha"]
             base_tree_sha = branch_info["commit"]["commit"]["tree"]["sha"]
             
-            # 2. Create blobs for each file
-            tree_items = []
-            for file_path, content in files.items():
-                # Create blob
-                blob_data = {
-                    "content": content,
-                    "encoding": "utf-8"
-                }
-                blob_response = await self._request(
-                    "POST", 
-                    f"/repos/{owner}/{repo}/git/blobs", 
-                    token, 
-                    data=blob_data
-                )
-                
-                tree_items.append({
+            # 2. Create blobs for all files concurrently (gather keeps order)
+            semaphore = asyncio.Semaphore(PUSH_CONCURRENCY)
+            
+            async def create_file_blob(content: str) -> Dict[str, Any]:
+                async with semaphore:
+                    return await self.create_blob(token, owner, repo, content)
+            
+            blobs = await asyncio.gather(*(create_file_blob(content) for content in files.values()))
+            tree_items = [
+                {
                     "path": file_path,
                     "mode": "100644",  # Regular file
                     "type": "blob",
-                    "sha": blob_response["sha"]
-                })
+                    "sha": blob["sha"]
+                }
+                for file_path, blob in zip(files, blobs)
+            ]
             
             # 3. Create a new tree
-            tree_data = {
-                "base_tree": base_tree_sha,
-                "tree": tree_items
-            }
-            tree_response = await self._request(
-                "POST",
-                f"/repos/{owner}/{repo}/git/trees",
-                token,
-                data=tree_data
-            )
+            tree_response = await self.create_tree(token, owner, repo, tree_items, base_tree=base_tree_sha)
             
             # 4. Create a new commit
-            commit_data = {
-                "message": commit_message,
-                "tree": tree_response["sha"],
-                "parents": [base_sha]
-            }
-            commit_response = await self._request(
-                "POST",
-                f"/repos/{owner}/{repo}/git/commits",
-                token,
-                data=commit_data
+            commit_response = await self.create_commit(
+                token, owner, repo, commit_message, tree_response["sha"], [base_sha]
             )
             
             # 5. Update the branch reference
-            ref_data = {
-                "sha": commit_response["sha"],
-                "force": False
-            }
-            await self._request(
-                "PATCH",
-                f"/repos/{owner}/{repo}/git/refs/heads/{branch}",
-                token,
-                data=ref_data
-            )
+            await self.update_ref(token, owner, repo, branch, commit_response["sha"])
             
             return {
                 "success": True,
@@ -185,10 +185,10 @@ class IntegrationService:
         owner, repo = link["owner"], link["repo"]
         
         try:
-            issues = await github_service.list_issues(token, owner, repo, state="open")
-            
             synced = 0
-            for issue in issues:
+            total_issues = 0
+            async for issue in github_service.iter_issues(token, owner, repo, state="open"):
+                total_issues += 1
                 issue_key = f"{owner}/{repo}#{issue['number']}"
                 
                 # Skip if already synced
@@ -213,7 +213,7 @@ class IntegrationService:
                 self.issue_task_links[issue_key] = task.id
                 synced += 1
             
-            return {"synced": synced, "total_issues": len(issues)}
+            return {"synced": synced, "total_issues": total_issues}
         except Exception as e:
             return {"synced": 0, "error": str(e)}
     